@@ -2,10 +2,25 @@
 Basic usage example for the Civilization Meta-Model.
 """
 
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 from civmodel import CivilizationModel, ParameterScanner, plot_phase_diagram
 
+
+def moving_average(x, w):
+    """Trailing moving average along the last axis via cumulative sums.
+
+    O(N) regardless of window; matches np.convolve(..., mode='valid') and
+    accepts a stack of equal-length series.
+    """
+    if w < 1:
+        raise ValueError(f"window must be >= 1, got {w}")
+    c = np.cumsum(x, axis=-1, dtype=np.float64)
+    c = np.concatenate((np.zeros(c.shape[:-1] + (1,)), c), axis=-1)
+    return (c[..., w:] - c[..., :-w]) / w
+
+
 def demonstrate_basic_simulation():
     """Demonstrate basic model functionality."""
     print("=== Civilization Meta-Model - Basic Demo ===\n")
@@ -55,38 +70,37 @@ def demonstrate_basic_simulation():
     
     # 5. Visualize results
     print("\n5. Creating visualizations...")
-    fig, axes = plt.subplots(2, 2, figsize=(12, 8))
+    # Named figure: re-running the demo reuses the same canvas instead of opening a new one
+    fig = plt.figure(num='civmodel_basic', figsize=(12, 8), clear=True)
+    axes = fig.subplots(2, 2)
+    
+    # All four series have the same length: smooth them in one cumsum pass.
+    # Shrink the window for short runs so the panels are never left empty
+    # (but keep it >= 1: an empty series then just gives empty curves).
+    window = max(1, min(30, len(innovations)))
+    ma1, ma2, syn_ma1, syn_ma2 = moving_average(
+        np.stack([innovations, innovations2, synergies, synergies2]), window
+    )
     
     # Innovation time series
-    window = 30
-    if len(innovations) >= window:
-        ma1 = np.convolve(innovations.astype(float), 
-                         np.ones(window)/window, mode='valid')
-        ma2 = np.convolve(innovations2.astype(float), 
-                         np.ones(window)/window, mode='valid')
-        
-        ax1 = axes[0, 0]
-        ax1.plot(ma1 * 100, 'b-', label='Window Period', linewidth=2)
-        ax1.plot(ma2 * 100, 'r-', label='Transition Period', linewidth=2)
-        ax1.set_xlabel('Time Step')
-        ax1.set_ylabel('Innovation Rate (%)')
-        ax1.set_title('Innovation Dynamics Comparison')
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
+    ax1 = axes[0, 0]
+    ax1.plot(ma1 * 100, 'b-', label='Window Period', linewidth=2)
+    ax1.plot(ma2 * 100, 'r-', label='Transition Period', linewidth=2)
+    ax1.set_xlabel('Time Step')
+    ax1.set_ylabel('Innovation Rate (%)')
+    ax1.set_title('Innovation Dynamics Comparison')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
     
     # Synergy comparison
     ax2 = axes[0, 1]
-    if len(synergies) >= window:
-        syn_ma1 = np.convolve(synergies, np.ones(window)/window, mode='valid')
-        syn_ma2 = np.convolve(synergies2, np.ones(window)/window, mode='valid')
-        
-        ax2.plot(syn_ma1, 'b-', label='Window Period', linewidth=2)
-        ax2.plot(syn_ma2, 'r-', label='Transition Period', linewidth=2)
-        ax2.set_xlabel('Time Step')
-        ax2.set_ylabel('Synergy Multiplier')
-        ax2.set_title('Synergy Dynamics Comparison')
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
+    ax2.plot(syn_ma1, 'b-', label='Window Period', linewidth=2)
+    ax2.plot(syn_ma2, 'r-', label='Transition Period', linewidth=2)
+    ax2.set_xlabel('Time Step')
+    ax2.set_ylabel('Synergy Multiplier')
+    ax2.set_title('Synergy Dynamics Comparison')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
     
     # Innovation event distribution
     ax3 = axes[1, 0]
@@ -100,10 +114,7 @@ def demonstrate_basic_simulation():
     ax3.grid(True, alpha=0.3, axis='y')
     
     # Add value labels on bars
-    for bar, count in zip(bars, innov_counts):
-        height = bar.get_height()
-        ax3.text(bar.get_x() + bar.get_width()/2, height + 0.5,
-                f'{count}', ha='center', va='bottom')
+    ax3.bar_label(bars, labels=[f'{c}' for c in innov_counts], padding=3)
     
     # Parameter space visualization
     ax4 = axes[1, 1]
@@ -122,7 +133,8 @@ def demonstrate_basic_simulation():
     
     plt.tight_layout()
     plt.savefig('basic_demo_results.png', dpi=150, bbox_inches='tight')
-    plt.show()
+    if not os.environ.get('CIVMODEL_HEADLESS'):
+        plt.show()
     
     print("\nVisualization saved as 'basic_demo_results.png'")
     
@@ -144,14 +156,15 @@ def demonstrate_phase_diagram():
         female_activation_range=(0.0, 1.0),
         female_activation_points=10,
         seeds=[42, 43],  # Fewer seeds for speed
-        n_workers=2
+        n_workers=max(1, (os.cpu_count() or 2) - 1)  # leave one core for the main process
     )
     
     # Visualize results
     print("Creating phase diagram...")
     fig = plot_phase_diagram(results)
     plt.savefig('phase_diagram.png', dpi=150, bbox_inches='tight')
-    plt.show()
+    if not os.environ.get('CIVMODEL_HEADLESS'):
+        plt.show()
     
     print("Phase diagram saved as 'phase_diagram.png'")
     
@@ -169,8 +182,8 @@ def demonstrate_phase_diagram():
         print(f"  Male exploration space: {ms_critical:.3f}")
         
         # Find innovation rate at critical point
-        fa_idx = np.argmin(np.abs(results['female_activation_values'] - fa_critical))
-        ms_idx = np.argmin(np.abs(results['male_space_values'] - ms_critical))
+        fa_idx = scanner.nearest_index(results['female_activation_values'], fa_critical)
+        ms_idx = scanner.nearest_index(results['male_space_values'], ms_critical)
         innov_at_critical = results['innovation_grid'][ms_idx, fa_idx] * 100
         
         print(f"  Innovation rate at critical point: {innov_at_critical:.2f}%")
@@ -179,6 +192,11 @@ def demonstrate_phase_diagram():
 
 
 if __name__ == "__main__":
+    # CIVMODEL_HEADLESS=1 selects the Agg backend and skips interactive windows (CI/batch runs)
+    if os.environ.get('CIVMODEL_HEADLESS'):
+        import matplotlib
+        matplotlib.use('Agg')
+    
     # Run basic simulation demo
     model1, model2 = demonstrate_basic_simulation()
     
@@ -16,16 +16,37 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib import font_manager
 from civmodel import CivilizationModel
 import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 warnings.filterwarnings('ignore')
-plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'Heiti TC', 'Hiragino Sans GB', 'PingFang SC']
+
+def _resolve_cjk_font(candidates):
+    """返回第一个已安装的中文字体名（只在导入时查找一次），找不到时返回 None"""
+    for name in candidates:
+        try:
+            font_manager.findfont(name, fallback_to_default=False)
+        except ValueError:
+            continue
+        return name
+    return None
+
+_CJK_FONT = _resolve_cjk_font(['Arial Unicode MS', 'Heiti TC', 'Hiragino Sans GB', 'PingFang SC'])
+if _CJK_FONT:
+    plt.rcParams['font.sans-serif'] = [_CJK_FONT]
 plt.rcParams['axes.unicode_minus'] = False
 
+# 示例输出文件保存到脚本所在目录
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@lru_cache(maxsize=1)
 def get_tang_song_parameters():
-    """返回唐宋各时期的模型参数估计"""
-    return {
+    """返回唐宋各时期的模型参数估计（只读映射，结果缓存）"""
+    periods = {
         'tang_early': {
             'name': '唐代早期 (618-755 CE)',
             'male_explore_space': 0.65,
@@ -59,6 +80,22 @@ def get_tang_song_parameters():
             'description': '科技文化高峰：指南针、火药、活字印刷'
         }
     }
+    # 缓存的结果被多个调用方共享，用只读视图防止被意外修改
+    return MappingProxyType({k: MappingProxyType(v) for k, v in periods.items()})
+
+def _simulate_period(params):
+    """运行单个时期的模拟（模块级函数，可被子进程序列化调用）"""
+    model = CivilizationModel(
+        male_explore_space=params['male_explore_space'],
+        female_activation=params['female_activation'],
+        N=params['N'],
+        d=params['d'],
+        seed=42,
+        verbose=False
+    )
+    
+    innovations, synergies, metadata = model.run(steps=200)
+    return metadata
 
 def run_case_study():
     """运行唐宋案例研究"""
@@ -68,37 +105,38 @@ def run_case_study():
     
     # 获取参数
     periods = get_tang_song_parameters()
-    results = []
+    n_periods = len(periods)
+    # 按指标分列存储（SoA），绘图时直接使用整列数组
+    results = {
+        'name': [],
+        'innovation_rate': np.empty(n_periods),
+        'avg_synergy': np.empty(n_periods),
+        'total_innovations': np.empty(n_periods, dtype=int),
+        'diversity': np.empty(n_periods)
+    }
     
-    # 模拟每个时期
     for period_key, params in periods.items():
         print(f"\n📜 模拟: {params['name']}")
         print(f"   描述: {params['description']}")
         print(f"   参数: male_explore_space={params['male_explore_space']:.2f}, "
               f"female_activation={params['female_activation']:.2f}")
-        
-        # 创建并运行模型
-        model = CivilizationModel(
-            male_explore_space=params['male_explore_space'],
-            female_activation=params['female_activation'],
-            N=params['N'],
-            d=params['d'],
-            seed=42,
-            verbose=False
-        )
-        
-        innovations, synergies, metadata = model.run(steps=200)
-        
+    
+    # 各时期相互独立，并行模拟；executor.map 保持输入顺序
+    # 只读映射无法 pickle，提交前转换为普通 dict
+    tasks = [dict(v) for v in periods.values()]
+    with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as ex:
+        all_metadata = list(ex.map(_simulate_period, tasks))
+    
+    print()
+    for i, (params, metadata) in enumerate(zip(periods.values(), all_metadata)):
         # 记录结果
-        results.append({
-            'name': params['name'],
-            'innovation_rate': metadata['innovation_rate'] * 100,
-            'avg_synergy': metadata['avg_synergy'],
-            'total_innovations': metadata['total_innovations'],
-            'diversity': metadata['diversity']
-        })
+        results['name'].append(params['name'])
+        results['innovation_rate'][i] = metadata['innovation_rate'] * 100
+        results['avg_synergy'][i] = metadata['avg_synergy']
+        results['total_innovations'][i] = metadata['total_innovations']
+        results['diversity'][i] = metadata['diversity']
         
-        print(f"   结果: 创新率={metadata['innovation_rate']*100:.2f}%, "
+        print(f"   {params['name']} 结果: 创新率={metadata['innovation_rate']*100:.2f}%, "
               f"协同效应={metadata['avg_synergy']:.2f}x")
     
     return results
@@ -107,12 +145,14 @@ def visualize_results(results, save_dir='.'):
     """可视化并保存结果"""
     print("\n📊 生成可视化图表...")
     
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+    # 命名图窗：重复运行时复用同一画布，而不是不断新建图窗
+    fig = plt.figure(num='civmodel_tangsong', figsize=(12, 10), clear=True)
+    axes = fig.subplots(2, 2)
     
     # 1. 创新率对比
     ax1 = axes[0, 0]
-    names = [r['name'].split(' ')[0] for r in results]  # 只取时期名称
-    innovation_rates = [r['innovation_rate'] for r in results]
+    names = [name.split(' ')[0] for name in results['name']]  # 只取时期名称
+    innovation_rates = results['innovation_rate']
     
     bars = ax1.bar(names, innovation_rates, color=['blue', 'lightblue', 'green', 'darkgreen'])
     ax1.set_ylabel('创新率 (%)')
@@ -120,13 +160,11 @@ def visualize_results(results, save_dir='.'):
     ax1.grid(True, alpha=0.3, axis='y')
     
     # 添加数值标签
-    for bar, rate in zip(bars, innovation_rates):
-        ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-                f'{rate:.1f}%', ha='center', va='bottom')
+    ax1.bar_label(bars, labels=[f'{r:.1f}%' for r in innovation_rates], padding=3)
     
     # 2. 协同效应对比
     ax2 = axes[0, 1]
-    synergies = [r['avg_synergy'] for r in results]
+    synergies = results['avg_synergy']
     ax2.plot(names, synergies, 'o-', linewidth=2, markersize=8)
     ax2.axhline(y=1.0, color='red', linestyle='--', alpha=0.5, label='无协同基准')
     ax2.set_ylabel('平均协同效应')
@@ -136,7 +174,7 @@ def visualize_results(results, save_dir='.'):
     
     # 3. 创新产出对比
     ax3 = axes[1, 0]
-    innovations = [r['total_innovations'] for r in results]
+    innovations = results['total_innovations']
     bars = ax3.bar(names, innovations, color='orange', alpha=0.7)
     ax3.set_ylabel('创新总数 (200步)')
     ax3.set_title('创新产出对比')
@@ -172,7 +210,8 @@ def visualize_results(results, save_dir='.'):
     plt.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"✅ 图表已保存: {output_path}")
     
-    plt.show()
+    if not os.environ.get('CIVMODEL_HEADLESS'):
+        plt.show()
     
     return fig
 
@@ -183,15 +222,15 @@ def print_summary(results):
     print("=" * 70)
     
     # 计算转型效果
-    tang_early = results[0]['innovation_rate']
-    song_peak = results[-1]['innovation_rate']
+    tang_early = results['innovation_rate'][0]
+    song_peak = results['innovation_rate'][-1]
     improvement = (song_peak - tang_early) / tang_early * 100
     
     print(f"\n📈 创新率增长: {tang_early:.2f}% → {song_peak:.2f}% "
           f"(提升 {improvement:.1f}%)")
     
-    print(f"🔄 协同效应: {results[0]['avg_synergy']:.2f}x → "
-          f"{results[-1]['avg_synergy']:.2f}x")
+    print(f"🔄 协同效应: {results['avg_synergy'][0]:.2f}x → "
+          f"{results['avg_synergy'][-1]:.2f}x")
     
     print("\n🔍 历史解释:")
     print("  • 科举制度完善显著扩大了精英探索空间")
@@ -212,8 +251,7 @@ def main():
         
         # 可视化结果
         # 确保输出到 examples 目录
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        fig = visualize_results(results, save_dir=script_dir)
+        fig = visualize_results(results, save_dir=_SCRIPT_DIR)
         
         # 打印总结
         print_summary(results)
@@ -228,4 +266,9 @@ def main():
         raise
 
 if __name__ == "__main__":
+    # 设置 CIVMODEL_HEADLESS=1 时使用 Agg 后端，跳过交互式窗口（CI/批量运行）
+    if os.environ.get('CIVMODEL_HEADLESS'):
+        import matplotlib
+        matplotlib.use('Agg')
+    
     main()
\ No newline at end of file
@@ -17,6 +17,7 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib import font_manager
 from matplotlib import colors
 from mpl_toolkits.mplot3d import Axes3D
 from scipy.ndimage import gaussian_filter
@@ -24,9 +25,25 @@ from civmodel import ParameterScanner, plot_phase_diagram
 import os
 import warnings
 warnings.filterwarnings('ignore')
-plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'Heiti TC', 'Hiragino Sans GB', 'PingFang SC']
+
+def _resolve_cjk_font(candidates):
+    """返回第一个已安装的中文字体名（只在导入时查找一次），找不到时返回 None"""
+    for name in candidates:
+        try:
+            font_manager.findfont(name, fallback_to_default=False)
+        except ValueError:
+            continue
+        return name
+    return None
+
+_CJK_FONT = _resolve_cjk_font(['Arial Unicode MS', 'Heiti TC', 'Hiragino Sans GB', 'PingFang SC'])
+if _CJK_FONT:
+    plt.rcParams['font.sans-serif'] = [_CJK_FONT]
 plt.rcParams['axes.unicode_minus'] = False
 
+# 示例输出文件保存到脚本所在目录
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
 def comprehensive_parameter_scan():
     """执行全面的参数空间扫描"""
     print("=" * 70)
@@ -48,7 +65,7 @@ def comprehensive_parameter_scan():
         female_activation_range=(0.0, 1.0),
         female_activation_points=25,
         seeds=[42, 43, 44],  # 多个种子确保稳定性
-        n_workers=4
+        n_workers=max(1, (os.cpu_count() or 2) - 1)  # 保留一个核心给主进程
     )
     
     return scanner, scan_results
@@ -73,8 +90,8 @@ def analyze_critical_regions(scan_results, scanner):
         print(f"   男性探索空间: {ms_critical:.3f}")
         
         # 计算临界点处的创新率
-        fa_idx = np.argmin(np.abs(fa_vals - fa_critical))
-        ms_idx = np.argmin(np.abs(ms_vals - ms_critical))
+        fa_idx = scanner.nearest_index(fa_vals, fa_critical)
+        ms_idx = scanner.nearest_index(ms_vals, ms_critical)
         innov_at_critical = innov_grid[ms_idx, fa_idx] * 100
         print(f"   创新率: {innov_at_critical:.2f}%")
     else:
@@ -83,18 +100,23 @@ def analyze_critical_regions(scan_results, scanner):
     
     # 2. 计算相边界
     print("\n📐 计算相边界...")
-    thresholds = [0.01, 0.05, 0.10, 0.20]  # 不同创新率阈值
-    phase_boundaries = {}
-    
-    for threshold in thresholds:
-        boundary_mask = innov_grid > threshold
-        phase_area = np.sum(boundary_mask) / boundary_mask.size * 100
-        phase_boundaries[threshold] = {
-            'mask': boundary_mask,
-            'area_percent': phase_area
-        }
+    thresholds = np.array([0.01, 0.05, 0.10, 0.20])  # 不同创新率阈值
+    
+    # 一次 digitize 给出每个格点超过的阈值个数（0-4），即所属相
+    phase_map = np.digitize(innov_grid, thresholds, right=True)
+    phase_counts = np.bincount(phase_map.ravel(), minlength=len(thresholds) + 1)
+    # 超过第 i 个阈值的格点 = 相编号 > i 的格点
+    area_percent = np.cumsum(phase_counts[::-1])[::-1][1:] / phase_map.size * 100
+    
+    for threshold, phase_area in zip(thresholds, area_percent):
         print(f"   创新率阈值 {threshold*100:.0f}%: 相面积占 {phase_area:.1f}%")
     
+    phase_boundaries = {
+        'thresholds': thresholds,
+        'phase_map': phase_map,
+        'area_percent': area_percent
+    }
+    
     return critical_point, phase_boundaries
 
 def sensitivity_analysis(scan_results):
@@ -106,9 +128,9 @@ def sensitivity_analysis(scan_results):
     innov_grid = scan_results['innovation_grid']
     syn_grid = scan_results['synergy_grid']
     
-    # 1. 参数边际效应
-    marginal_effect_fa = np.mean(np.diff(innov_grid, axis=1), axis=0)
-    marginal_effect_ms = np.mean(np.diff(innov_grid, axis=0), axis=1)
+    # 1. 参数边际效应（先求边际均值再取中心差分，与参数轴等长）
+    marginal_effect_fa = np.gradient(innov_grid.mean(axis=0), fa_vals)
+    marginal_effect_ms = np.gradient(innov_grid.mean(axis=1), ms_vals)
     
     # 2. 计算参数重要性（方差贡献）
     total_variance = np.var(innov_grid)
@@ -149,14 +171,19 @@ def visualize_analysis_results(scanner, scan_results, critical_point, phase_boun
     innov_grid = scan_results['innovation_grid']
     syn_grid = scan_results['synergy_grid']
     
+    # 展平视图只计算一次，供直方图和散点图共用（ravel 对连续数组不复制）
+    innov_flat_pct = innov_grid.ravel() * 100.0
+    syn_flat = syn_grid.ravel()
+    
     # 创建多面板图表
-    fig = plt.figure(figsize=(16, 12))
+    # 命名图窗：重复运行时复用同一画布，而不是不断新建图窗
+    fig = plt.figure(num='civmodel_paramscan', figsize=(16, 12), clear=True)
     
     # 1. 综合相图
     ax1 = plt.subplot(2, 3, 1)
     im1 = ax1.imshow(innov_grid * 100, aspect='auto', origin='lower',
                     extent=[fa_vals[0], fa_vals[-1], ms_vals[0], ms_vals[-1]],
-                    cmap='RdYlGn', vmin=0, vmax=30)
+                    cmap='RdYlGn', vmin=0, vmax=30, rasterized=True)
     
     # 标记临界点
     if critical_point:
@@ -175,15 +202,22 @@ def visualize_analysis_results(scanner, scan_results, critical_point, phase_boun
         '现代转型': (0.85, 0.9)
     }
     
-    for label, (fa, ms) in historical_points.items():
-        ax1.scatter(fa, ms, s=80, edgecolor='black', alpha=0.7)
-        ax1.text(fa + 0.03, ms, label, fontsize=8, alpha=0.8)
+    hp_labels = list(historical_points)
+    hp_fa = np.fromiter((v[0] for v in historical_points.values()), dtype=float)
+    hp_ms = np.fromiter((v[1] for v in historical_points.values()), dtype=float)
+    # 单次 scatter 绘制全部参考点（一个 PathCollection），颜色沿用默认色序
+    ax1.scatter(hp_fa, hp_ms, s=80, edgecolor='black', alpha=0.7,
+                color=[f'C{i}' for i in range(len(hp_labels))])
+    for label, fa, ms in zip(hp_labels, hp_fa, hp_ms):
+        ax1.annotate(label, (fa, ms), xytext=(fa + 0.03, ms), fontsize=8, alpha=0.8)
     
     ax1.set_xlabel('女性激活度')
     ax1.set_ylabel('男性探索空间')
     ax1.set_title('创新率相图 (%)')
     plt.colorbar(im1, ax=ax1)
-    ax1.legend(loc='upper left', fontsize=8)
+    # 参考点用文字标注，图例中只有临界点；未找到临界点时不画图例
+    if critical_point:
+        ax1.legend(loc='upper left', fontsize=8)
     
     # 2. 相边界可视化
     ax2 = plt.subplot(2, 3, 2)
@@ -191,13 +225,9 @@ def visualize_analysis_results(scanner, scan_results, critical_point, phase_boun
     # 创建自定义颜色映射显示不同相
     phase_cmap = colors.ListedColormap(['gray', 'yellow', 'orange', 'red'])
     
-    phase_map = np.zeros_like(innov_grid)
-    for i, (threshold, data) in enumerate(phase_boundaries.items()):
-        phase_map[data['mask']] = i + 1
-    
-    im2 = ax2.imshow(phase_map, aspect='auto', origin='lower',
+    im2 = ax2.imshow(phase_boundaries['phase_map'], aspect='auto', origin='lower',
                     extent=[fa_vals[0], fa_vals[-1], ms_vals[0], ms_vals[-1]],
-                    cmap=phase_cmap, vmin=0, vmax=4)
+                    cmap=phase_cmap, vmin=0, vmax=4, rasterized=True)
     
     ax2.set_xlabel('女性激活度')
     ax2.set_ylabel('男性探索空间')
@@ -217,13 +247,13 @@ def visualize_analysis_results(scanner, scan_results, critical_point, phase_boun
     ax3 = plt.subplot(2, 3, 3)
     
     # 女性激活度的边际效应
-    ax3.plot(fa_vals[:-1], sensitivity['marginal_fa'] * 1000, 
+    ax3.plot(fa_vals, sensitivity['marginal_fa'] * 1000, 
             'b-', linewidth=2, marker='o', markersize=4,
             label='女性激活度边际效应')
     
     # 男性探索空间的边际效应
     ax3_secondary = ax3.twinx()
-    ax3_secondary.plot(ms_vals[:-1], sensitivity['marginal_ms'] * 1000,
+    ax3_secondary.plot(ms_vals, sensitivity['marginal_ms'] * 1000,
                       'r-', linewidth=2, marker='s', markersize=4,
                       label='男性探索空间边际效应')
     
@@ -257,7 +287,7 @@ def visualize_analysis_results(scanner, scan_results, critical_point, phase_boun
     # 5. 创新率分布直方图
     ax5 = plt.subplot(2, 3, 5)
     
-    innov_rates = innov_grid.flatten() * 100
+    innov_rates = innov_flat_pct
     ax5.hist(innov_rates, bins=30, alpha=0.7, color='skyblue', edgecolor='black')
     ax5.axvline(x=np.mean(innov_rates), color='red', linestyle='--',
                linewidth=2, label=f'均值: {np.mean(innov_rates):.1f}%')
@@ -273,16 +303,15 @@ def visualize_analysis_results(scanner, scan_results, critical_point, phase_boun
     # 6. 协同效应与创新率关系
     ax6 = plt.subplot(2, 3, 6)
     
-    # 散点图：协同效应 vs 创新率
-    sc = ax6.scatter(syn_grid.flatten(), innov_grid.flatten() * 100,
-                    c=innov_grid.flatten() * 100, cmap='viridis',
-                    alpha=0.6, edgecolor='black', linewidth=0.5)
+    # 六边形分箱密度图：协同效应 vs 创新率（图元数与网格分辨率无关）
+    hb = ax6.hexbin(syn_flat, innov_flat_pct, C=innov_flat_pct,
+                    reduce_C_function=np.mean, gridsize=30, cmap='viridis',
+                    rasterized=True)
     
     # 添加回归线
-    from scipy import stats
-    slope, intercept, r_value, p_value, std_err = stats.linregress(
-        syn_grid.flatten(), innov_grid.flatten() * 100
-    )
+    # 只需要斜率、截距和 r，用 numpy 闭式解即可
+    slope, intercept = np.polyfit(syn_flat, innov_flat_pct, 1)
+    r_value = np.corrcoef(syn_flat, innov_flat_pct)[0, 1]
     
     x_range = np.linspace(np.min(syn_grid), np.max(syn_grid), 100)
     ax6.plot(x_range, intercept + slope * x_range, 
@@ -295,17 +324,17 @@ def visualize_analysis_results(scanner, scan_results, critical_point, phase_boun
     ax6.legend(fontsize=8)
     ax6.grid(True, alpha=0.3)
     
-    plt.colorbar(sc, ax=ax6, label='创新率 (%)')
+    plt.colorbar(hb, ax=ax6, label='创新率 (%)')
     
     plt.tight_layout()
     
     # 保存图表
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_path = os.path.join(script_dir, 'parameter_analysis_results.png')
+    output_path = os.path.join(_SCRIPT_DIR, 'parameter_analysis_results.png')
     plt.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"✅ 分析图表已保存: {output_path}")
     
-    plt.show()
+    if not os.environ.get('CIVMODEL_HEADLESS'):
+        plt.show()
     
     return fig
 
@@ -392,4 +421,9 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    # 设置 CIVMODEL_HEADLESS=1 时使用 Agg 后端，跳过交互式窗口（CI/批量运行）
+    if os.environ.get('CIVMODEL_HEADLESS'):
+        import matplotlib
+        matplotlib.use('Agg')
+    
     main()
\ No newline at end of file
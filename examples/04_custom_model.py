@@ -4,106 +4,281 @@
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+from scipy import sparse
 from civmodel import CivilizationModel
 import os
+import multiprocessing
+
+try:  # numba 为可选依赖，未安装时稀疏网络退回 scipy 的 CSR 矩阵乘法
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# 示例输出文件保存到脚本所在目录
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# matplotlib 延迟到首次绘图时导入，仅使用模型类时无需付出其启动开销
+_plt = None
+
+# 边密度低于该值时按 CSR 只遍历非零边，否则用稠密矩阵乘法
+_SPARSE_DENSITY_THRESHOLD = 0.2
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _neighbor_influence(indptr, indices, states, out, strength):
+        """按 CSR 边表并行计算每个智能体的社会影响，写入 out"""
+        n, d = states.shape
+        for i in prange(n):
+            start, end = indptr[i], indptr[i + 1]
+            deg = end - start
+            for k in range(d):
+                if deg == 0:
+                    out[i, k] = 0.0
+                    continue
+                acc = 0.0
+                for e in range(start, end):
+                    acc += states[indices[e], k]
+                out[i, k] = (acc / deg - states[i, k]) * strength
+        return out
+
+    def _make_memory_kernel(dim):
+        """生成记忆更新内核；dim 为编译期常量时维度循环可被完全展开"""
+        @njit(fastmath=True)
+        def kernel(old_states, states, institution, best_states, best_performance, decay):
+            n = states.shape[0]
+            d = dim if dim > 0 else states.shape[1]
+            for i in range(n):
+                old_sq = 0.0
+                new_sq = 0.0
+                for k in range(d):
+                    a = old_states[i, k] - institution[k]
+                    b = states[i, k] - institution[k]
+                    old_sq += a * a
+                    new_sq += b * b
+                best_performance[i] *= decay
+                if new_sq < 0.81 * old_sq:  # 有明显改进
+                    for k in range(d):
+                        best_states[i, k] = states[i, k]
+                    best_performance[i] += 1.0
+        return kernel
+    
+    # 预设中出现的维度各生成一个特化内核，其余维度走通用内核
+    _MEMORY_KERNELS = {dim: _make_memory_kernel(dim) for dim in (2, 4, 6, 8)}
+    _memory_kernel_generic = _make_memory_kernel(0)
+else:
+    _neighbor_influence = None
+    _MEMORY_KERNELS = {}
+    _memory_kernel_generic = None
 
-plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'Heiti TC', 'Hiragino Sans GB', 'PingFang SC']
-plt.rcParams['axes.unicode_minus'] = False
 
 class NetworkCivilizationModel(CivilizationModel):
     """简化的网络增强模型"""
     
-    def __init__(self, network_density=0.1, influence_strength=0.15, **kwargs):
+    def __init__(self, network_density=0.1, influence_strength=0.15, dtype=np.float32, **kwargs):
         super().__init__(**kwargs)
         self.network_density = network_density
         self.influence_strength = influence_strength
+        # 邻居均值等网络运算的精度（float32 带宽减半，足以保持定性行为）
+        self.dtype = dtype
+        # 网络采样使用由 (seed, 1) 派生的独立随机流：若与基础模型同用 seed，
+        # 两个生成器会产生完全相同的随机序列，网络拓扑将与初始状态相关
+        self.net_rng = np.random.default_rng([self.seed, 1])
         self._initialize_network()
     
     def _initialize_network(self):
         """简化网络初始化"""
-        # 创建简单的随机网络
-        self.adjacency = np.random.rand(self.N, self.N) < self.network_density
-        np.fill_diagonal(self.adjacency, 0)
-        # 确保对称
-        self.adjacency = np.maximum(self.adjacency, self.adjacency.T)
+        # 创建简单的随机网络：直接在上三角采样边，不构造 N×N 随机矩阵
+        # 原先对 rand(N, N) < density 取对称，单条无向边出现的概率为 1-(1-p)^2
+        edge_prob = 1 - (1 - self.network_density) ** 2
+        src, dst = self._sample_edges(self.N, edge_prob, self.net_rng)
+        # 确保对称：每条无向边记录两个方向
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        
+        # 邻接关系按行位压缩存储（每行补齐到整数个 uint64），内存为布尔矩阵的 1/8
+        n_bytes = (self.N + 7) // 8
+        packed = np.zeros((self.N, -(-n_bytes // 8) * 8), dtype=np.uint8)
+        np.bitwise_or.at(packed, (rows, cols >> 3), (0x80 >> (cols & 7)).astype(np.uint8))
+        self.adj_bits = packed.view(np.uint64)
         
         # 计算节点度
-        self.degrees = np.sum(self.adjacency, axis=1)
+        self.degrees = np.bincount(rows, minlength=self.N)
         self.avg_degree = np.mean(self.degrees) if self.N > 0 else 0
-    
-    def _agent_exploration(self, agent_idx: int) -> np.ndarray:
-        """添加网络影响的探索"""
-        base_exploration = super()._agent_exploration(agent_idx)
         
-        # 找到邻居
-        neighbors = np.where(self.adjacency[agent_idx])[0]
-        if len(neighbors) > 0:
-            neighbor_states = self.states[neighbors]
-            neighbor_mean = neighbor_states.mean(axis=0)
-            
-            # 简单的社会影响
-            social_influence = (neighbor_mean - self.states[agent_idx])
-            return base_exploration + social_influence * self.influence_strength
+        # 网络静态，汇总指标在初始化时计算一次
+        self._total_edges = int(self.degrees.sum())  # 有向计数，即无向边数的两倍
+        self._is_connected = bool((self.degrees > 0).all())  # 没有孤立节点
+        self._density = float(self._total_edges / (self.N * (self.N - 1))) if self.N > 1 else 0.0
+        
+        # CSR 邻接表：按 (行, 列) 排序边，网络静态，初始化时构建一次
+        order = np.lexsort((cols, rows))
+        self.indices = cols[order].astype(np.int32)
+        self.indptr = np.zeros(self.N + 1, dtype=np.int32)
+        np.cumsum(self.degrees, out=self.indptr[1:])
+        # 每个智能体的邻居下标（indices 的切片视图），查询为 O(1)
+        self.neighbors_list = np.split(self.indices, self.indptr[1:-1])
         
-        return base_exploration
+        # 稀疏网络：保存 CSR 矩阵，只遍历实际存在的边
+        self._use_sparse = self._density < _SPARSE_DENSITY_THRESHOLD
+        # 按度归一化的行随机矩阵 P：P @ states 一次得到所有智能体的邻居均值
+        inv_degree = (1.0 / np.maximum(self.degrees, 1)).astype(self.dtype)
+        if self._use_sparse:
+            self.P = sparse.csr_matrix(
+                (np.repeat(inv_degree, self.degrees), self.indices, self.indptr),
+                shape=(self.N, self.N)
+            )
+        else:
+            # 稠密网络：低精度矩阵用于批量矩阵乘法
+            self.P = np.zeros((self.N, self.N), dtype=self.dtype)
+            self.P[rows, cols] = inv_degree[rows]
+    
+    @staticmethod
+    def _sample_edges(n, prob, rng):
+        """以概率 prob 独立采样上三角 (i < j) 的每个位置，返回边端点数组
+        
+        相邻两条边在上三角展开序列中的间隔服从几何分布，
+        因此只需生成约 E 个随机数，时间和内存均为 O(E)。
+        """
+        n_pairs = n * (n - 1) // 2
+        if n_pairs == 0 or prob <= 0:
+            flat = np.empty(0, dtype=np.int64)
+        elif prob >= 1:
+            flat = np.arange(n_pairs, dtype=np.int64)
+        else:
+            chunks = []
+            pos = -1
+            while pos < n_pairs - 1:
+                batch = int(prob * (n_pairs - pos) * 1.1) + 16
+                flat = pos + np.cumsum(rng.geometric(prob, size=batch))
+                chunks.append(flat[flat < n_pairs])
+                pos = flat[-1]
+            flat = np.concatenate(chunks)
+        
+        # 展开下标 -> (i, j)：第 i 行起点为 i*n - i*(i+1)/2
+        b = 2 * n - 1
+        i = np.floor((b - np.sqrt(b * b - 8.0 * flat)) / 2).astype(np.int64)
+        row_start = i * n - i * (i + 1) // 2
+        # 浮点开方可能差一行，修正边界情况
+        over = row_start > flat
+        i[over] -= 1
+        row_start = i * n - i * (i + 1) // 2
+        under = flat - row_start >= n - 1 - i
+        i[under] += 1
+        row_start = i * n - i * (i + 1) // 2
+        j = flat - row_start + i + 1
+        return i, j
+    
+    @property
+    def adjacency(self) -> np.ndarray:
+        """解压得到的 N×N 布尔邻接矩阵（按需构造，不常驻内存）"""
+        bits = np.unpackbits(self.adj_bits.view(np.uint8), axis=1, count=self.N)
+        return bits.astype(bool)
+    
+    def neighbors(self, agent_idx: int) -> np.ndarray:
+        """返回该智能体的邻居下标（预先构建的 CSR 切片，无需扫描整行）"""
+        return self.neighbors_list[agent_idx]
+    
+    def _all_social_influence(self) -> np.ndarray:
+        """批量计算所有智能体的社会影响，返回 (N, d) 数组
+        
+        稀疏网络走 CSR（有 numba 时用并行内核，否则用 scipy 稀疏乘法），
+        稠密网络用一次行随机矩阵乘法；均按 self.dtype 精度计算。
+        """
+        # 基础模型的状态为 float32，与 self.dtype 相同时不复制
+        states = self.states.astype(self.dtype, copy=False)
+        if self._use_sparse and _neighbor_influence is not None:
+            out = np.empty_like(states)
+            return _neighbor_influence(self.indptr, self.indices, states,
+                                       out, self.influence_strength)
+        
+        # 稀疏 P 走 CSR 的 SpMV，稠密 P 走 SGEMM
+        neighbor_means = self.P @ states
+        social = (neighbor_means - states) * self.influence_strength
+        # 孤立节点没有社会影响
+        social[self.degrees == 0] = 0.0
+        return social
+    
+    def _batch_exploration(self) -> np.ndarray:
+        """添加网络影响的探索（所有智能体一次性计算）"""
+        return super()._batch_exploration() + self._all_social_influence()
     
     def get_network_metrics(self):
-        """获取简单网络指标"""
-        # 计算网络连通性
-        connected = np.all(np.sum(self.adjacency, axis=1) > 0)
+        """获取简单网络指标（直接返回初始化时缓存的值）"""
         return {
             'avg_degree': float(self.avg_degree),
-            'network_density': float(np.sum(self.degrees) / (self.N * (self.N - 1))) if self.N > 1 else 0,
-            'connected': connected
+            'network_density': self._density,
+            'connected': self._is_connected
         }
 
 
 class MemoryCivilizationModel(CivilizationModel):
     """简化的记忆增强模型"""
     
-    def __init__(self, memory_strength=0.2, memory_decay=0.95, **kwargs):
+    def __init__(self, memory_strength=0.2, memory_decay=0.95, dtype=np.float32, **kwargs):
         super().__init__(**kwargs)
         self.memory_strength = memory_strength
         self.memory_decay = memory_decay
+        # 记忆数组的精度（float32 带宽减半，足以保持定性行为）
+        self.dtype = dtype
         
         # 初始化记忆：每个智能体记住自己的最佳状态
-        self.best_states = self.states.copy()
-        self.best_performance = np.zeros(self.N)
+        self.best_states = self.states.astype(dtype, copy=True)
+        self.best_performance = np.zeros(self.N, dtype=dtype)
+        
+        # 每步复用的暂存缓冲区，避免反复分配
+        self._prev_states = np.empty_like(self.states)
+        self._diff_buf = np.empty_like(self.states)
+        self._old_sq = np.empty(self.N)
+        self._new_sq = np.empty(self.N)
+        self._improved = np.empty(self.N, dtype=bool)
+        
+        # 有 numba 时按维度选择特化的记忆更新内核
+        self._memory_kernel = _MEMORY_KERNELS.get(self.d, _memory_kernel_generic)
     
     def step(self):
         """重写step方法，包含记忆更新"""
-        # 保存旧状态用于比较
-        old_states = self.states.copy()
+        # 保存旧状态用于比较（写入预分配缓冲区）
+        np.copyto(self._prev_states, self.states)
         
         # 执行基础步骤
         innovation, synergy = super().step()
         
         # 更新记忆：如果新状态更好，则记住它
-        for i in range(self.N):
-            # 简单性能评估：距离系统中心的接近程度
-            old_dist = np.linalg.norm(old_states[i] - self.institution)
-            new_dist = np.linalg.norm(self.states[i] - self.institution)
-            
-            if new_dist < old_dist * 0.9:  # 有明显改进
-                self.best_states[i] = self.states[i].copy()
-                self.best_performance[i] = self.best_performance[i] * self.memory_decay + 1
-            else:
-                self.best_performance[i] = self.best_performance[i] * self.memory_decay
+        if self._memory_kernel is not None:
+            self._memory_kernel(self._prev_states, self.states, self.institution,
+                                self.best_states, self.best_performance, self.memory_decay)
+            return innovation, synergy
         
-        return innovation, synergy
-    
-    def _agent_exploration(self, agent_idx: int) -> np.ndarray:
-        """添加记忆引导的探索"""
-        base_exploration = super()._agent_exploration(agent_idx)
+        # 简单性能评估：距离系统中心的接近程度（对所有智能体一次性计算）
+        # 距离非负，new < 0.9*old 等价于 new² < 0.81*old²，比较平方距离省去开方
+        self._row_sq_distances(self._prev_states, out=self._old_sq)
+        self._row_sq_distances(self.states, out=self._new_sq)
+        np.multiply(self._old_sq, 0.81, out=self._old_sq)
+        improved = np.less(self._new_sq, self._old_sq, out=self._improved)  # 有明显改进
         
-        # 如果记忆有足够强度，添加记忆引导
-        if self.best_performance[agent_idx] > 0.5:
-            memory_guidance = (self.best_states[agent_idx] - self.states[agent_idx])
-            memory_weight = min(self.memory_strength * self.best_performance[agent_idx], 0.3)
-            return base_exploration + memory_guidance * memory_weight
+        self.best_states[improved] = self.states[improved]
+        self.best_performance *= self.memory_decay
+        self.best_performance += improved
         
-        return base_exploration
+        return innovation, synergy
+    
+    def _row_sq_distances(self, states: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """逐行计算到制度中心的欧氏距离平方，结果写入 out"""
+        np.subtract(states, self.institution, out=self._diff_buf)
+        return np.einsum('ij,ij->i', self._diff_buf, self._diff_buf, out=out)
+    
+    def _all_memory_guidance(self) -> np.ndarray:
+        """一次性计算所有智能体的记忆引导，返回 (N, d) 数组"""
+        # 记忆强度足够（> 0.5）的智能体才受引导，权重上限 0.3
+        weights = np.minimum(self.memory_strength * self.best_performance, 0.3)
+        weights *= self.best_performance > 0.5
+        # 基础模型的状态为 float32，与 self.dtype 相同时不复制
+        states = self.states.astype(self.dtype, copy=False)
+        return (self.best_states - states) * weights[:, None]
+    
+    def _batch_exploration(self) -> np.ndarray:
+        """添加记忆引导的探索（所有智能体一次性计算）"""
+        return super()._batch_exploration() + self._all_memory_guidance()
     
     def get_memory_metrics(self):
         """获取简单记忆指标"""
@@ -117,6 +292,21 @@ class MemoryCivilizationModel(CivilizationModel):
         }
 
 
+def _run_one(kind, params, steps):
+    """构建并运行单个模型（模块级函数，可被子进程序列化调用）"""
+    if kind == 'network':
+        model = NetworkCivilizationModel(**params, network_density=0.15)
+    elif kind == 'memory':
+        model = MemoryCivilizationModel(**params, memory_strength=0.25)
+    else:
+        model = CivilizationModel(**params)
+    
+    innovations, synergies, metadata = model.run(steps=steps)
+    net_metrics = model.get_network_metrics() if kind == 'network' else None
+    mem_metrics = model.get_memory_metrics() if kind == 'memory' else None
+    return metadata, net_metrics, mem_metrics
+
+
 def run_simple_comparison():
     """运行简化比较"""
     print("=" * 60)
@@ -133,38 +323,42 @@ def run_simple_comparison():
         'verbose': False
     }
     
-    results = []
-    
-    # 1. 基础模型
+    models = [('基础模型', 'base'), ('网络增强', 'network'), ('记忆增强', 'memory')]
     print("\n1. 基础模型...")
-    base_model = CivilizationModel(**base_params)
-    innov_base, syn_base, meta_base = base_model.run(steps=100)
-    results.append(('基础模型', meta_base, None, None))
-    
-    # 2. 网络增强模型
     print("2. 网络增强模型...")
-    net_model = NetworkCivilizationModel(**base_params, network_density=0.15)
-    innov_net, syn_net, meta_net = net_model.run(steps=100)
-    net_metrics = net_model.get_network_metrics()
-    results.append(('网络增强', meta_net, net_metrics, None))
-    
-    # 3. 记忆增强模型
     print("3. 记忆增强模型...")
-    mem_model = MemoryCivilizationModel(**base_params, memory_strength=0.25)
-    innov_mem, syn_mem, meta_mem = mem_model.run(steps=100)
-    mem_metrics = mem_model.get_memory_metrics()
-    results.append(('记忆增强', meta_mem, None, mem_metrics))
+    
+    # 三个模型相互独立，并行运行
+    with multiprocessing.Pool(len(models)) as pool:
+        outputs = pool.starmap(_run_one, [(kind, base_params, 100) for _, kind in models])
+    
+    results = [(name, meta, net_metrics, mem_metrics)
+               for (name, _), (meta, net_metrics, mem_metrics) in zip(models, outputs)]
     
     return results
 
 
+def _get_pyplot():
+    """首次调用时导入 matplotlib 并配置中文字体，之后直接返回缓存的模块"""
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as plt
+        plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'Heiti TC', 'Hiragino Sans GB', 'PingFang SC']
+        plt.rcParams['axes.unicode_minus'] = False
+        _plt = plt
+    return _plt
+
+
 def visualize_simple_results(results):
     """简化可视化"""
     print("\n📊 生成简化对比图表...")
+    plt = _get_pyplot()
     
     model_names = [r[0] for r in results]
     
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+    # 命名图窗：重复运行时复用同一画布，而不是不断新建图窗
+    fig = plt.figure(num='civmodel_custom', figsize=(12, 10), clear=True)
+    axes = fig.subplots(2, 2)
     
     # 1. 创新率对比
     ax1 = axes[0, 0]
@@ -243,12 +437,12 @@ def visualize_simple_results(results):
     plt.tight_layout()
     
     # 保存
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_path = os.path.join(script_dir, 'simple_model_comparison.png')
+    output_path = os.path.join(_SCRIPT_DIR, 'simple_model_comparison.png')
     plt.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"✅ 图表已保存: {output_path}")
     
-    plt.show()
+    if not os.environ.get('CIVMODEL_HEADLESS'):
+        plt.show()
     return fig
 
 
@@ -312,4 +506,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # 设置 CIVMODEL_HEADLESS=1 时使用 Agg 后端，跳过交互式窗口（CI/批量运行）
+    if os.environ.get('CIVMODEL_HEADLESS'):
+        import matplotlib
+        matplotlib.use('Agg')
+    
     main()
\ No newline at end of file
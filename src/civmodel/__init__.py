@@ -6,7 +6,7 @@ A computational framework for simulating civilizational phase transitions.
 from .core import CivilizationModel
 from .scanner import ParameterScanner
 from .constants import PARAMS, HISTORICAL_PRESETS, load_preset, merge_params
-from .utils.visualize import plot_phase_diagram, plot_innovation_timeseries
+from .utils.visualize import plot_phase_diagram, plot_innovation_timeseries, PhaseDiagramFigure
 EnhancedGenderModel = CivilizationModel  # 如果希望保持方案中的名称
 __version__ = "0.1.0"
 __author__ = "Civilization Meta-Model Contributors"
@@ -21,4 +21,5 @@ __all__ = [
     "np.random.RandomState",
     "plot_phase_diagram",
     "plot_innovation_timeseries",
+    "PhaseDiagramFigure",
 ]
\ No newline at end of file
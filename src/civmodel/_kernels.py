@@ -0,0 +1,112 @@
+"""
+Optional Numba-compiled kernels for the simulation hot path.
+
+Numba is an optional dependency: when it is not installed every kernel is
+``None`` and callers fall back to their vectorized NumPy implementation.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def step_kernel(states, out, delta, noise, draws, explore_scale, inst_mult, institution,
+                    noise_scale, pull_strength, explore_prob, lo, hi):
+        """
+        Fused exploration + institutional pull + clip for all agents.
+
+        Reads ``states`` and writes the bounded new states into ``out`` and
+        the applied change into ``delta`` in a single pass, without
+        materializing intermediate ``(N, d)`` arrays. ``noise`` (standard
+        normal, shape (N, d)) and ``draws`` (uniform, shape (N,)) are
+        pre-drawn by the caller so the random stream matches the NumPy
+        path. The scalar parameters are cast to float32 and combined in the
+        same order as the NumPy path, so both produce identical states.
+        """
+        n, d = states.shape
+        scale = np.float32(noise_scale)
+        pull_k = np.float32(pull_strength)
+        prob = np.float32(explore_prob)
+        lo32 = np.float32(lo)
+        hi32 = np.float32(hi)
+        for i in prange(n):
+            explores = draws[i] < prob
+            pull = pull_k * inst_mult[i]
+            for k in range(d):
+                step = np.float32(0.0)
+                if explores:
+                    step = (noise[i, k] * scale * explore_scale[i]
+                            + (institution[k] - states[i, k]) * pull)
+                x = states[i, k] + step
+                # As in the NumPy path, the delta is only recomputed where
+                # clipping changed the state
+                if x < lo32 or x > hi32:
+                    x = min(max(x, lo32), hi32)
+                    step = x - states[i, k]
+                out[i, k] = x
+                delta[i, k] = step
+        return out
+
+    @njit(cache=True)
+    def post_step_kernel(history, hist_len, hist_idx, new_mean, institution, new_institution,
+                         threshold, lr):
+        """
+        Fused innovation detection, history update and institution update.
+
+        Compares ``new_mean`` with the first ``hist_len`` rows of the
+        ``history`` ring buffer, then writes it into slot ``hist_idx``; the
+        institution moved toward it is written into ``new_institution``
+        (``institution`` itself is left untouched). The arithmetic follows
+        the NumPy path: float32 differences and institution update, squared
+        distances accumulated in float64.
+
+        Returns
+        -------
+        tuple
+            (innovation, new_hist_idx, new_hist_len)
+        """
+        capacity, d = history.shape
+        innovation = False
+        if hist_len >= 2:
+            min_sq = 0.0
+            for h in range(hist_len):
+                acc = np.float64(0.0)
+                for k in range(d):
+                    diff = history[h, k] - new_mean[k]
+                    acc += diff * diff
+                if h == 0 or acc < min_sq:
+                    min_sq = acc
+            innovation = np.sqrt(min_sq) > threshold
+        
+        keep = np.float32(1 - lr)
+        rate = np.float32(lr)
+        for k in range(d):
+            history[hist_idx, k] = new_mean[k]
+            new_institution[k] = keep * institution[k] + rate * new_mean[k]
+        return innovation, (hist_idx + 1) % capacity, min(hist_len + 1, capacity)
+
+    @njit(cache=True, fastmath=True)
+    def rolling_mean_kernel(x, window, out):
+        """
+        Moving average over full windows, written into ``out``.
+
+        Keeps a running sum over a single pass; ``out`` must have length
+        ``len(x) - window + 1``.
+        """
+        s = 0.0
+        for i in range(window):
+            s += x[i]
+        out[0] = s / window
+        for i in range(window, x.shape[0]):
+            s += x[i] - x[i - window]
+            out[i - window + 1] = s / window
+        return out
+else:
+    step_kernel = None
+    post_step_kernel = None
+    rolling_mean_kernel = None
@@ -2,6 +2,7 @@
 Global constants and preset configurations for the civilization meta-model.
 """
 
+from types import MappingProxyType
 from typing import Dict, Any
 import numpy as np
 
@@ -43,6 +44,9 @@ PARAMS = {
     "save_trajectory": True,
 }
 
+# 只读视图：合并参数时直接解包，无需防御性复制，且可防止意外修改默认值
+_PARAMS_FROZEN = MappingProxyType(PARAMS)
+
 # =============================================================================
 # 历史时期预设参数
 # =============================================================================
@@ -92,6 +96,21 @@ HISTORICAL_PRESETS = {
     }
 }
 
+# 预设与默认参数在导入时合并一次，load_preset 只需复制缓存的只读视图
+_PRESET_CACHE = {
+    name: MappingProxyType({**PARAMS, **preset})
+    for name, preset in HISTORICAL_PRESETS.items()
+}
+
+# 参数扫描的合理范围 / Parameter ranges for scanning
+_RANGES = (
+    ("male_explore_space", (0.1, 1.0)),
+    ("female_activation", (0.0, 1.0)),
+    ("exploration_strength", (0.1, 1.0)),
+    ("innovation_base_threshold", (0.01, 0.2)),
+    ("institution_pull_strength", (0.01, 0.2)),
+)
+
 # =============================================================================
 # 工具函数
 # =============================================================================
@@ -111,12 +130,7 @@ def merge_params(custom_params: Dict[str, Any], base_params: Dict[str, Any] = No
     dict
         合并后的参数字典
     """
-    if base_params is None:
-        base_params = PARAMS.copy()
-    
-    result = base_params.copy()
-    result.update(custom_params)
-    return result
+    return {**(base_params if base_params is not None else _PARAMS_FROZEN), **custom_params}
 
 
 def load_preset(preset_name: str) -> Dict[str, Any]:
@@ -138,11 +152,13 @@ def load_preset(preset_name: str) -> Dict[str, Any]:
     KeyError
         当预设名称不存在时
     """
-    if preset_name not in HISTORICAL_PRESETS:
+    try:
+        preset = _PRESET_CACHE[preset_name]
+    except KeyError:
         available = list(HISTORICAL_PRESETS.keys())
-        raise KeyError(f"Preset '{preset_name}' not found. Available: {available}")
+        raise KeyError(f"Preset '{preset_name}' not found. Available: {available}") from None
     
-    return merge_params(HISTORICAL_PRESETS[preset_name])
+    return dict(preset)
 
 
 def validate_params(params: Dict[str, Any]) -> None:
@@ -188,10 +204,4 @@ def get_param_ranges() -> Dict[str, tuple]:
     dict
         参数范围字典
     """
-    return {
-        "male_explore_space": (0.1, 1.0),
-        "female_activation": (0.0, 1.0),
-        "exploration_strength": (0.1, 1.0),
-        "innovation_base_threshold": (0.01, 0.2),
-        "institution_pull_strength": (0.01, 0.2),
-    }
\ No newline at end of file
+    return dict(_RANGES)
\ No newline at end of file
@@ -5,6 +5,33 @@ Core simulation engine for the civilization meta-model.
 import numpy as np
 from typing import Tuple, List, Optional, Dict, Any
 from .constants import PARAMS, merge_params, validate_params
+from ._kernels import step_kernel, post_step_kernel
+
+# Below this fraction of exploring agents, only their rows are bound-checked
+_SPARSE_CLIP_FRACTION = 0.3
+
+# Methods whose base behaviour CivilizationModel.run_batch re-implements
+_BATCH_INLINED_METHODS = (
+    "_initialize_agents", "_initialize_institution", "_initialize_history",
+    "_batch_exploration", "_detect_innovation", "_update_history",
+    "_update_institution", "calculate_diversity", "calculate_synergy", "step",
+)
+
+
+def _clip_with_delta(new_states: np.ndarray, delta: np.ndarray,
+                     old_states: np.ndarray, lo: float, hi: float) -> bool:
+    """
+    Clip ``new_states`` to [lo, hi] in place, keeping ``delta`` consistent.
+    
+    ``delta`` is recomputed (in place) only for the entries that clipping
+    changed. Returns True if any entry was clipped.
+    """
+    if new_states.size == 0 or (new_states.min() >= lo and new_states.max() <= hi):
+        return False
+    clipped = (new_states < lo) | (new_states > hi)
+    np.clip(new_states, lo, hi, out=new_states)
+    delta[clipped] = new_states[clipped] - old_states[clipped]
+    return True
 
 
 class CivilizationModel:
@@ -63,12 +90,26 @@ class CivilizationModel:
         
         # Set random seed
         self.seed = seed
-        #np.random.seed(seed)
-        self.rng = np.random.RandomState(seed)
+        self.rng = np.random.default_rng(seed)
+        
+        # The fused Numba step kernel (if available) implements the base
+        # dynamics only; subclasses that extend _batch_exploration use NumPy
+        self._use_step_kernel = (
+            step_kernel is not None
+            and type(self)._batch_exploration is CivilizationModel._batch_exploration
+        )
+        # Likewise the fused post-step kernel replaces the innovation, history
+        # and institution updates unless a subclass customizes one of them
+        self._use_post_step_kernel = post_step_kernel is not None and all(
+            getattr(type(self), name) is getattr(CivilizationModel, name)
+            for name in ("_detect_innovation", "_update_history", "_update_institution")
+        )
+        
         # Initialize model state
         self._initialize_agents()
         self._initialize_institution()
         self._initialize_history()
+        self._refresh_param_cache()
         
         self.verbose = verbose
         self.innovation_count = 0
@@ -84,104 +125,180 @@ class CivilizationModel:
         self.N = self.params["N"]
         self.d = self.params["d"]
         
-        # Gender assignment
-        n_male = self.N // 2
-        n_female = self.N - n_male
-        self.genders = np.array(['male'] * n_male + ['female'] * n_female)
-        
-        # Shuffle genders for random distribution
-        #np.random.shuffle(self.genders)
+        # Gender assignment (True = male)
+        self.n_male = self.N // 2
+        self.n_female = self.N - self.n_male
+        self.is_male = np.zeros(self.N, dtype=bool)
+        self.is_male[:self.n_male] = True
+        self._genders = None
         
-        # Initialize states with gender-based positioning
-        self.states = np.zeros((self.N, self.d))
+        # Agents are grouped by gender (males in rows 0:n_male) so that each
+        # group is a contiguous, zero-copy slice of the state array
+        self._male_slice = slice(0, self.n_male)
+        self._female_slice = slice(self.n_male, self.N)
         
-        male_mask = self.genders == 'male'
-        female_mask = self.genders == 'female'
+        # Initialize states with gender-based positioning (float32 halves memory traffic)
+        self.states = np.zeros((self.N, self.d), dtype=np.float32)
         
         # Male agents: centered around (-0.25, 0) with some variance
-        if np.any(male_mask):
-            self.states[male_mask] = self.rng.uniform(
+        if self.n_male > 0:
+            self.states[self._male_slice] = self.rng.uniform(
                 low=-0.5, high=0.0, 
-                size=(np.sum(male_mask), self.d)
+                size=(self.n_male, self.d)
             )
         
         # Female agents: centered around (-0.6, 0) with more constraint
-        if np.any(female_mask):
-            self.states[female_mask] = self.rng.uniform(
+        if self.n_female > 0:
+            self.states[self._female_slice] = self.rng.uniform(
                 low=-0.8, high=-0.3,
-                size=(np.sum(female_mask), self.d)
+                size=(self.n_female, self.d)
             )
+        
+        # Running per-group state sums (float64 accumulators), kept in sync by step()
+        self.male_sum = self.states[self._male_slice].sum(axis=0, dtype=np.float64)
+        self.female_sum = self.states[self._female_slice].sum(axis=0, dtype=np.float64)
+        
+        # Per-step scratch buffers: random draws are written in place and the
+        # new states alternate with self.states, so step() does not allocate them
+        self._noise_buf = np.empty((self.N, self.d), dtype=np.float32)
+        self._uniform_buf = np.empty(self.N, dtype=np.float32)
+        self._new_states = np.empty_like(self.states)
+        self._delta_buf = np.empty_like(self.states)
+        
+        # Whether every state is known to lie within the bounds; initial
+        # states may not, until the first full clip
+        self._states_in_bounds = False
+    
+    def _refresh_param_cache(self) -> None:
+        """
+        Cache the parameters used on every step as plain attributes.
+        
+        Avoids repeated ``self.params`` lookups in the step hot path. Also
+        precomputes the per-agent gender modulation: ``explore_scale`` holds
+        the noise scale (male_explore_space for males, female_activation for
+        females) and ``inst_mult`` the responsiveness to the institutional
+        pull (1 for males, ``1 - 0.8 * female_activation`` for females).
+        Must be called again whenever ``self.params`` changes; the parameter
+        property setters do this automatically.
+        """
+        p = self.params
+        self._noise_scale = float(p["exploration_strength"])
+        self._pull_k = float(p["institution_pull_strength"])
+        self._explore_prob = float(p["exploration_prob"])
+        self._lo, self._hi = (float(b) for b in p["state_bounds"])
+        self._learning_rate = float(p["institution_learning_rate"])
+        
+        # Dynamic innovation threshold based on female activation,
+        # kept from going too low
+        female_effect = 1 - self.female_activation * p["female_threshold_modulation"]
+        self._innovation_threshold = max(p["innovation_base_threshold"] * female_effect, 0.01)
+        
+        self._synergy_female_threshold = float(p["synergy_female_threshold"])
+        self._synergy_diversity_weight = float(p["synergy_diversity_weight"])
+        self._synergy_upper_bound = float(p["synergy_upper_bound"])
+        
+        self.explore_scale = np.where(
+            self.is_male, self.male_explore_space, self.female_activation
+        ).astype(np.float32)
+        self.inst_mult = np.where(
+            self.is_male, 1.0, 1 - self.female_activation * 0.8
+        ).astype(np.float32)
+    
+    @property
+    def is_male_packed(self) -> np.ndarray:
+        """
+        Gender mask packed 8 agents per byte (``np.packbits(is_male)``).
+        
+        A compact representation for storing or shipping the gender layout
+        of very large populations; ``np.unpackbits(packed, count=N)``
+        restores ``is_male``.
+        """
+        return np.packbits(self.is_male)
+    
+    @property
+    def genders(self) -> np.ndarray:
+        """Per-agent gender labels ('male'/'female'), built lazily from ``is_male``."""
+        if self._genders is None:
+            self._genders = np.where(self.is_male, 'male', 'female')
+        return self._genders
     
     def _initialize_institution(self) -> None:
         """Initialize the institutional center."""
         # Start with weighted average (males have more influence initially)
-        male_mask = self.genders == 'male'
-        female_mask = self.genders == 'female'
-        
-        if np.any(male_mask):
-            male_mean = self.states[male_mask].mean(axis=0)
-        else:
-            male_mean = np.zeros(self.d)
-            
-        if np.any(female_mask):
-            female_mean = self.states[female_mask].mean(axis=0)
-        else:
-            female_mean = np.zeros(self.d)
+        male_mean = self.male_sum / self.n_male if self.n_male > 0 else np.zeros(self.d)
+        female_mean = self.female_sum / self.n_female if self.n_female > 0 else np.zeros(self.d)
         
         # Initial institution biased toward male positions
         bias = 0.7  # 70% toward male mean
-        self.institution = bias * male_mean + (1 - bias) * female_mean
+        self.institution = (bias * male_mean + (1 - bias) * female_mean).astype(np.float32)
     
     def _initialize_history(self) -> None:
         """Initialize the history buffer for innovation detection."""
-        self.history_buffer = [self.states.mean(axis=0).copy()]
         self.max_history_size = self.params.get("history_buffer_size", 5)
+        
+        # Fixed-size ring buffer of recent mean states; _hist_idx is the next write slot
+        capacity = max(self.max_history_size, 1)
+        self._hist = np.empty((capacity, self.d), dtype=np.float32)
+        self._hist[0] = self.states.mean(axis=0)
+        self._hist_len = 1
+        self._hist_idx = 1 % capacity
+    
+    @property
+    def history_buffer(self) -> List[np.ndarray]:
+        """Recent mean states, oldest first (a copy of the ring buffer)."""
+        start = (self._hist_idx - self._hist_len) % len(self._hist)
+        order = (start + np.arange(self._hist_len)) % len(self._hist)
+        return list(self._hist[order])
     
     @property
     def male_explore_space(self) -> float:
         """Get the male exploration space parameter."""
         return self.params["male_explore_space"]
     
+    @male_explore_space.setter
+    def male_explore_space(self, value: float) -> None:
+        """Set the male exploration space parameter."""
+        self._set_param("male_explore_space", value)
+    
     @property
     def female_activation(self) -> float:
         """Get the female activation parameter."""
         return self.params["female_activation"]
     
-    def _agent_exploration(self, agent_idx: int) -> np.ndarray:
+    @female_activation.setter
+    def female_activation(self, value: float) -> None:
+        """Set the female activation parameter."""
+        self._set_param("female_activation", value)
+    
+    def _set_param(self, key: str, value: Any) -> None:
+        """Update one parameter, validate, and refresh the cached step constants."""
+        params = {**self.params, key: value}
+        validate_params(params)
+        self.params = params
+        self._refresh_param_cache()
+    
+    def _batch_exploration(self) -> np.ndarray:
         """
-        Compute exploration vector for a single agent.
+        Compute exploration vectors for all agents at once.
+        
+        Each agent draws Gaussian noise scaled by its gender-specific
+        exploration space and is pulled toward the institution, with
+        activated females responding less to the pull. Subclasses extend
+        the dynamics by overriding this method and adding their own
+        ``(N, d)`` contribution.
         
-        Parameters
-        ----------
-        agent_idx : int
-            Index of the agent
-            
         Returns
         -------
         np.ndarray
-            Exploration vector
+            Exploration vectors, shape (N, d)
         """
-        gender = self.genders[agent_idx]
-        current_state = self.states[agent_idx]
+        # Base random exploration, scaled per gender
+        self.rng.standard_normal(out=self._noise_buf, dtype=np.float32)
+        noise = self._noise_buf * self._noise_scale
+        exploration = noise * self.explore_scale[:, None]
         
-        # Base random exploration
-        noise_scale = self.params["exploration_strength"]
-        base_noise = self.rng.randn(self.d) * noise_scale
-        
-        # Gender-specific modulation
-        if gender == 'male':
-            exploration = base_noise * self.male_explore_space
-        else:  # female
-            exploration = base_noise * self.female_activation
-        
-        # Institutional pull (toward current institution)
-        pull_strength = self.params["institution_pull_strength"]
-        institution_pull = (self.institution - current_state) * pull_strength
-        
-        # Gender-specific response to institution
-        if gender == 'female':
-            # Females are less responsive to institution when activated
-            institution_pull = institution_pull * (1 - self.female_activation * 0.8)
+        # Institutional pull with gender-specific responsiveness
+        institution_pull = (self.institution - self.states) * (self._pull_k * self.inst_mult)[:, None]
         
         return exploration + institution_pull
     
@@ -199,26 +316,15 @@ class CivilizationModel:
         bool
             True if innovation detected
         """
-        if len(self.history_buffer) < 2:
+        if self._hist_len < 2:
             return False
         
-        # Calculate distances to historical states
-        distances = []
-        for hist_state in self.history_buffer:
-            dist = np.linalg.norm(new_mean_state - hist_state)
-            distances.append(dist)
-        
-        min_distance = np.min(distances)
-        
-        # Dynamic threshold based on female activation
-        base_threshold = self.params["innovation_base_threshold"]
-        female_effect = 1 - self.female_activation * self.params["female_threshold_modulation"]
-        threshold = base_threshold * female_effect
-        
-        # Ensure threshold doesn't go too low
-        threshold = max(threshold, 0.01)
+        # Distance to the closest historical state
+        diffs = self._hist[:self._hist_len] - new_mean_state
+        min_distance = np.sqrt((diffs * diffs).sum(axis=1, dtype=np.float64).min())
         
-        return min_distance > threshold
+        # Threshold depends on female activation (see _refresh_param_cache)
+        return bool(min_distance > self._innovation_threshold)
     
     def _update_institution(self, new_mean_state: np.ndarray) -> None:
         """
@@ -229,8 +335,9 @@ class CivilizationModel:
         new_mean_state : np.ndarray
             Current mean state of the system
         """
-        learning_rate = self.params["institution_learning_rate"]
-        self.institution = (1 - learning_rate) * self.institution + learning_rate * new_mean_state
+        learning_rate = self._learning_rate
+        self.institution = ((1 - learning_rate) * self.institution
+                            + learning_rate * new_mean_state).astype(np.float32)
     
     def _update_history(self, new_mean_state: np.ndarray) -> None:
         """
@@ -241,11 +348,11 @@ class CivilizationModel:
         new_mean_state : np.ndarray
             New mean state to add to history
         """
-        self.history_buffer.append(new_mean_state.copy())
-        
-        # Maintain buffer size
-        if len(self.history_buffer) > self.max_history_size:
-            self.history_buffer.pop(0)
+        # Overwrite the oldest entry once the buffer is full
+        capacity = len(self._hist)
+        self._hist[self._hist_idx] = new_mean_state
+        self._hist_idx = (self._hist_idx + 1) % capacity
+        self._hist_len = min(self._hist_len + 1, capacity)
     
     def calculate_diversity(self) -> float:
         """
@@ -256,16 +363,13 @@ class CivilizationModel:
         float
             Diversity measure (norm of difference between group means)
         """
-        male_mask = self.genders == 'male'
-        female_mask = self.genders == 'female'
-        
-        if np.sum(male_mask) == 0 or np.sum(female_mask) == 0:
+        if self.n_male == 0 or self.n_female == 0:
             return 0.0
         
-        male_mean = self.states[male_mask].mean(axis=0)
-        female_mean = self.states[female_mask].mean(axis=0)
+        male_mean = self.male_sum / self.n_male
+        female_mean = self.female_sum / self.n_female
         
-        return np.linalg.norm(male_mean - female_mean)
+        return float(np.linalg.norm(male_mean - female_mean))
     
     def calculate_synergy(self) -> float:
         """
@@ -276,15 +380,15 @@ class CivilizationModel:
         float
             Synergy multiplier (1.0 = no synergy)
         """
-        if self.female_activation < self.params["synergy_female_threshold"]:
+        if self.female_activation < self._synergy_female_threshold:
             return 1.0
         
         diversity = self.calculate_diversity()
         synergy_base = 1.0 + self.female_activation * 0.5
-        diversity_effect = diversity * self.params["synergy_diversity_weight"]
+        diversity_effect = diversity * self._synergy_diversity_weight
         
         synergy = synergy_base + diversity_effect
-        return min(synergy, self.params["synergy_upper_bound"])
+        return min(synergy, self._synergy_upper_bound)
     
     def step(self) -> Tuple[bool, float]:
         """
@@ -295,31 +399,66 @@ class CivilizationModel:
         tuple
             (innovation_occurred, synergy_value)
         """
-        new_states = self.states.copy()
-        
-        # Agent exploration phase
-        exploration_prob = self.params["exploration_prob"]
-        for i in range(self.N):
-            if self.rng.rand() < exploration_prob:
-                explore_vector = self._agent_exploration(i)
-                new_states[i] += explore_vector
-        
-        # Apply state bounds
-        bounds = self.params["state_bounds"]
-        new_states = np.clip(new_states, bounds[0], bounds[1])
+        # Agent exploration phase: each agent explores with probability exploration_prob
+        exploration_prob = self._explore_prob
+        lo, hi = self._lo, self._hi
+        new_states = self._new_states
+        self.rng.random(out=self._uniform_buf, dtype=np.float32)
+        
+        if self._use_step_kernel:
+            # Same draws, in the same order, as the NumPy path below
+            self.rng.standard_normal(out=self._noise_buf, dtype=np.float32)
+            delta = self._delta_buf
+            step_kernel(self.states, new_states, delta, self._noise_buf, self._uniform_buf,
+                        self.explore_scale, self.inst_mult, self.institution,
+                        self._noise_scale, self._pull_k, exploration_prob, lo, hi)
+            self._states_in_bounds = True
+        else:
+            explore_mask = self._uniform_buf < exploration_prob
+            delta = np.multiply(explore_mask[:, None], self._batch_exploration(), out=self._delta_buf)
+            np.add(self.states, delta, out=new_states)
+            
+            # Apply state bounds. Agents that did not explore keep their
+            # (already bounded) state, so when few agents move only their
+            # rows are checked and clipped
+            if self._states_in_bounds and np.count_nonzero(explore_mask) < _SPARSE_CLIP_FRACTION * self.N:
+                rows = np.flatnonzero(explore_mask)
+                moved, moved_delta = new_states[rows], delta[rows]
+                if _clip_with_delta(moved, moved_delta, self.states[rows], lo, hi):
+                    new_states[rows] = moved
+                    delta[rows] = moved_delta
+            else:
+                _clip_with_delta(new_states, delta, self.states, lo, hi)
+                self._states_in_bounds = True
+        
+        # Update the per-group sums (and hence the mean) incrementally from the delta
+        self.male_sum += delta[self._male_slice].sum(axis=0)
+        self.female_sum += delta[self._female_slice].sum(axis=0)
         
         # Calculate new system state
-        new_mean_state = new_states.mean(axis=0)
-        
-        # Innovation detection
-        innovation = self._detect_innovation(new_mean_state)
-        if innovation:
-            self.innovation_count += 1
+        new_mean_state = ((self.male_sum + self.female_sum) / self.N).astype(np.float32)
         
-        # Update system state
+        # Update system state (the old states become next step's scratch buffer)
+        self._new_states = self.states
         self.states = new_states
-        self._update_history(new_mean_state)
-        self._update_institution(new_mean_state)
+        
+        # Innovation detection, then history and institution updates
+        if self._use_post_step_kernel:
+            # Like _update_institution, bind a new institution array rather
+            # than modifying the old one (it may be held by callers)
+            new_institution = np.empty_like(self.institution)
+            innovation, self._hist_idx, self._hist_len = post_step_kernel(
+                self._hist, self._hist_len, self._hist_idx, new_mean_state,
+                self.institution, new_institution,
+                self._innovation_threshold, self._learning_rate
+            )
+            self.institution = new_institution
+            innovation = bool(innovation)
+        else:
+            innovation = self._detect_innovation(new_mean_state)
+            self._update_history(new_mean_state)
+            self._update_institution(new_mean_state)
+        self.innovation_count += innovation
         
         # Calculate synergy
         synergy = self.calculate_synergy()
@@ -382,6 +521,148 @@ class CivilizationModel:
         
         return innovations, synergies, metadata
     
+    def run_batch(self, seeds: List[int], steps: Optional[int] = None,
+                  warmup: int = 50) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Run independent replicas of this model's configuration, one per seed.
+        
+        All replicas advance together: states are held as an ``(S, N, d)``
+        array and each step is a single batched NumPy update, so the
+        per-step Python overhead is paid once rather than once per seed.
+        Replica ``s`` draws from its own ``default_rng(seeds[s])`` in the
+        same order as ``run``, so it reproduces a fresh model built with
+        that seed. The model's own state is not modified. Only the base
+        dynamics are supported: subclasses that override the step,
+        initialization, innovation, history, institution, diversity or
+        synergy methods raise ``NotImplementedError``.
+        
+        Parameters
+        ----------
+        seeds : list of int
+            Random seeds, one per replica
+        steps : int, optional
+            Number of steps to run (uses params["simulation_steps"] if None)
+        warmup : int, default=50
+            Number of initial steps to exclude from innovation rate calculation
+        
+        Returns
+        -------
+        tuple
+            (innovations_array, synergy_array, metadata_dict); the arrays have
+            shape (S, steps) and the per-replica metadata entries shape (S,)
+        """
+        # The batched loop re-implements these methods inline, so a subclass
+        # customizing any of them must run its seeds individually
+        overridden = [
+            name for name in _BATCH_INLINED_METHODS
+            if getattr(type(self), name) is not getattr(CivilizationModel, name)
+        ]
+        if overridden:
+            raise NotImplementedError(
+                f"{type(self).__name__} overrides {', '.join(overridden)}; "
+                f"run each seed with run()"
+            )
+        
+        if steps is None:
+            steps = self.params["simulation_steps"]
+        
+        S, N, d = len(seeds), self.N, self.d
+        ms, fs = self._male_slice, self._female_slice
+        rngs = [np.random.default_rng(seed) for seed in seeds]
+        
+        # Initial states, per replica exactly as in _initialize_agents
+        states = np.zeros((S, N, d), dtype=np.float32)
+        for s, rng in enumerate(rngs):
+            if self.n_male > 0:
+                states[s, ms] = rng.uniform(low=-0.5, high=0.0, size=(self.n_male, d))
+            if self.n_female > 0:
+                states[s, fs] = rng.uniform(low=-0.8, high=-0.3, size=(self.n_female, d))
+        male_sum = states[:, ms].sum(axis=1, dtype=np.float64)
+        female_sum = states[:, fs].sum(axis=1, dtype=np.float64)
+        
+        # Initial institution biased toward male positions
+        male_mean = male_sum / self.n_male if self.n_male > 0 else np.zeros((S, d))
+        female_mean = female_sum / self.n_female if self.n_female > 0 else np.zeros((S, d))
+        bias = 0.7
+        institution = (bias * male_mean + (1 - bias) * female_mean).astype(np.float32)
+        
+        # History ring buffers advance in lockstep, so they share index and length
+        capacity = max(self.max_history_size, 1)
+        hist = np.empty((S, capacity, d), dtype=np.float32)
+        hist[:, 0] = states.mean(axis=1)
+        hist_len, hist_idx = 1, 1 % capacity
+        
+        # Loop-invariant parameters
+        exploration_prob = self._explore_prob
+        noise_strength = self._noise_scale
+        lo, hi = self._lo, self._hi
+        explore_scale = self.explore_scale[:, None]
+        pull_mult = (self._pull_k * self.inst_mult)[:, None]
+        learning_rate = self._learning_rate
+        threshold = self._innovation_threshold
+        synergy_active = (self.female_activation >= self._synergy_female_threshold
+                          and self.n_male > 0 and self.n_female > 0)
+        
+        draws = np.empty((S, N), dtype=np.float32)
+        noise = np.empty((S, N, d), dtype=np.float32)
+        innovations = np.zeros((S, steps), dtype=bool)
+        synergies = np.ones((S, steps))
+        
+        for t in range(steps):
+            for s, rng in enumerate(rngs):
+                rng.random(out=draws[s], dtype=np.float32)
+                rng.standard_normal(out=noise[s], dtype=np.float32)
+            
+            explore_mask = draws < exploration_prob
+            exploration = noise * noise_strength * explore_scale
+            institution_pull = (institution[:, None, :] - states) * pull_mult
+            delta = explore_mask[..., None] * (exploration + institution_pull)
+            new_states = states + delta
+            
+            # Apply state bounds (same element-wise rule as step())
+            _clip_with_delta(new_states, delta, states, lo, hi)
+            
+            male_sum += delta[:, ms].sum(axis=1)
+            female_sum += delta[:, fs].sum(axis=1)
+            new_mean_state = ((male_sum + female_sum) / N).astype(np.float32)
+            
+            if hist_len >= 2:
+                diffs = hist[:, :hist_len] - new_mean_state[:, None, :]
+                min_distance = np.sqrt((diffs * diffs).sum(axis=2, dtype=np.float64).min(axis=1))
+                innovations[:, t] = min_distance > threshold
+            
+            states = new_states
+            hist[:, hist_idx] = new_mean_state
+            hist_idx = (hist_idx + 1) % capacity
+            hist_len = min(hist_len + 1, capacity)
+            institution = ((1 - learning_rate) * institution
+                           + learning_rate * new_mean_state).astype(np.float32)
+            
+            if synergy_active:
+                diversity = np.linalg.norm(male_sum / self.n_male - female_sum / self.n_female, axis=1)
+                synergy = (1.0 + self.female_activation * 0.5
+                           + diversity * self._synergy_diversity_weight)
+                synergies[:, t] = np.minimum(synergy, self._synergy_upper_bound)
+        
+        if self.n_male > 0 and self.n_female > 0:
+            diversity = np.linalg.norm(male_sum / self.n_male - female_sum / self.n_female, axis=1)
+        else:
+            diversity = np.zeros(S)
+        
+        effective = innovations[:, warmup:] if steps > warmup else innovations
+        metadata = {
+            "seeds": np.asarray(seeds),
+            "innovation_rate": effective.mean(axis=1),
+            "total_innovations": innovations.sum(axis=1),
+            "avg_synergy": synergies.mean(axis=1),
+            "diversity": diversity,
+            "steps": steps,
+            "warmup": warmup,
+            "params": self.params.copy()
+        }
+        
+        return innovations, synergies, metadata
+    
     def get_system_state(self) -> Dict[str, Any]:
         """
         Get current system state for analysis.
@@ -391,15 +672,9 @@ class CivilizationModel:
         dict
             System state information
         """
-        male_mask = self.genders == 'male'
-        female_mask = self.genders == 'female'
-        
-        male_states = self.states[male_mask] if np.any(male_mask) else None
-        female_states = self.states[female_mask] if np.any(female_mask) else None
-        
         return {
-            "male_mean": male_states.mean(axis=0) if male_states is not None else None,
-            "female_mean": female_states.mean(axis=0) if female_states is not None else None,
+            "male_mean": self.male_sum / self.n_male if self.n_male > 0 else None,
+            "female_mean": self.female_sum / self.n_female if self.n_female > 0 else None,
             "system_mean": self.states.mean(axis=0),
             "institution": self.institution,
             "diversity": self.calculate_diversity(),
@@ -2,16 +2,105 @@
 Parameter space scanning utilities for the civilization meta-model.
 """
 
+import os
 import numpy as np
 from typing import Dict, Any, List, Tuple, Optional
 from tqdm import tqdm
-import multiprocessing as mp
-from functools import partial
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
 
 from .core import CivilizationModel
 from .constants import PARAMS, merge_params
 
 
+def _run_cell(male_explore_space: float, female_activation: float,
+              seeds: List[int], base_params: Dict[str, Any]) -> Tuple[float, float, float]:
+    """
+    Run all seeds of one grid cell for parameter scanning.
+    
+    The seeds are simulated together with ``CivilizationModel.run_batch`` and
+    the results averaged over seeds.
+    
+    Parameters
+    ----------
+    male_explore_space : float
+        Male exploration space of the cell
+    female_activation : float
+        Female activation of the cell
+    seeds : list of int
+        Random seeds to average over
+    base_params : dict
+        Base parameters
+    
+    Returns
+    -------
+    tuple
+        (innovation_rate, avg_synergy, avg_diversity), averaged over seeds
+    """
+    # Merge parameters
+    sim_params = {
+        **base_params,
+        'male_explore_space': male_explore_space,
+        'female_activation': female_activation
+    }
+    
+    # Create model and run every seed as one batch
+    model = CivilizationModel(
+        male_explore_space=male_explore_space,
+        female_activation=female_activation,
+        params=sim_params
+    )
+    
+    innovations, synergies, metadata = model.run_batch(seeds)
+    
+    return (
+        metadata['innovation_rate'].mean(),
+        metadata['avg_synergy'].mean(),
+        metadata['diversity'].mean()
+    )
+
+
+# Base parameters cached in each worker process by _init_worker, so they are
+# pickled once per worker instead of once per task
+_BASE_PARAMS: Optional[Dict[str, Any]] = None
+
+
+def _init_worker(base_params: Dict[str, Any]) -> None:
+    """Process-pool initializer: cache the scan's base parameters."""
+    global _BASE_PARAMS
+    _BASE_PARAMS = base_params
+
+
+def _run_chunk(chunk: np.ndarray, seeds: List[int],
+               base_params: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """
+    Run a batch of grid cells in one worker task.
+    
+    Defined at module level so it can be pickled to worker processes.
+    
+    Parameters
+    ----------
+    chunk : np.ndarray
+        Cells to run, shape (n, 3): ``[flat_idx, male_explore_space, female_activation]``
+    seeds : list of int
+        Random seeds to average over in every cell
+    base_params : dict, optional
+        Base parameters; if None the worker's cached ``_BASE_PARAMS`` is used
+    
+    Returns
+    -------
+    np.ndarray
+        Results, shape (n, 4): ``[flat_idx, innovation_rate, avg_synergy, avg_diversity]``
+    """
+    if base_params is None:
+        base_params = _BASE_PARAMS
+    
+    results = np.empty((len(chunk), 4))
+    results[:, 0] = chunk[:, 0]
+    for row, (_, ms, fa) in enumerate(chunk):
+        results[row, 1:] = _run_cell(float(ms), float(fa), seeds, base_params)
+    return results
+
+
 class ParameterScanner:
     """
     Systematic scanner of the civilization model parameter space.
@@ -34,7 +123,8 @@ class ParameterScanner:
                 female_activation_range: Tuple[float, float] = (0.0, 1.0),
                 female_activation_points: int = 15,
                 seeds: Optional[List[int]] = None,
-                n_workers: int = 4) -> Dict[str, np.ndarray]:
+                n_workers: Optional[int] = 4,
+                executor: Optional[Executor] = None) -> Dict[str, np.ndarray]:
         """
         Perform 2D parameter scan over male space and female activation.
         
@@ -50,8 +140,12 @@ class ParameterScanner:
             Number of points in female activation dimension
         seeds : list, optional
             Random seeds for averaging (uses base_params if None)
-        n_workers : int, default=4
-            Number of parallel workers
+        n_workers : int, optional, default=4
+            Number of parallel worker processes (uses ``os.cpu_count()`` if None)
+        executor : concurrent.futures.Executor, optional
+            Pre-built process pool to run simulations on. It is left open so
+            it can be reused across scans; if None a pool of ``n_workers``
+            processes is created and shut down for this scan only.
         
         Returns
         -------
@@ -70,96 +164,79 @@ class ParameterScanner:
         if seeds is None:
             seeds = self.base_params.get("random_seeds", [42, 43, 44])
         
-        # Prepare all parameter combinations
-        param_combinations = []
-        for i, ms in enumerate(male_space_values):
-            for j, fa in enumerate(female_activation_values):
-                for seed in seeds:
-                    param_combinations.append({
-                        'male_explore_space': ms,
-                        'female_activation': fa,
-                        'seed': seed,
-                        'grid_position': (i, j)
-                    })
+        # One task row per grid cell: [flat_idx, male_space, female_activation];
+        # each cell runs all seeds as one batch
+        combos = np.stack(
+            np.meshgrid(male_space_values, female_activation_values, indexing='ij'), axis=-1
+        ).reshape(-1, 2)
+        n_cells = len(combos)
+        tasks = np.column_stack([np.arange(n_cells), combos])
+        seeds = list(seeds)
+        
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
         
         # Run simulations in parallel
-        print(f"Scanning {len(param_combinations)} parameter combinations "
+        print(f"Scanning {n_cells * len(seeds)} parameter combinations "
               f"with {n_workers} workers...")
         
-        with mp.Pool(n_workers) as pool:
-            results = list(tqdm(
-                pool.imap(partial(self._run_single_simulation, base_params=self.base_params), 
-                         param_combinations),
-                total=len(param_combinations)
-            ))
-        
-        # Aggregate results
-        innovation_grid = np.zeros((male_space_points, female_activation_points))
-        synergy_grid = np.zeros((male_space_points, female_activation_points))
-        diversity_grid = np.zeros((male_space_points, female_activation_points))
-        count_grid = np.zeros((male_space_points, female_activation_points))
-        
-        for (i, j), innovation_rate, avg_synergy, avg_diversity in results:
-            innovation_grid[i, j] += innovation_rate
-            synergy_grid[i, j] += avg_synergy
-            diversity_grid[i, j] += avg_diversity
-            count_grid[i, j] += 1
-        
-        # Average over seeds
-        mask = count_grid > 0
-        innovation_grid[mask] /= count_grid[mask]
-        synergy_grid[mask] /= count_grid[mask]
-        diversity_grid[mask] /= count_grid[mask]
+        # Batch many cells per worker task (a few chunks per worker keeps
+        # the load balanced while amortizing IPC over the chunk)
+        chunksize = max(1, n_cells // (4 * n_workers))
+        chunks = [tasks[k:k + chunksize] for k in range(0, n_cells, chunksize)]
+        
+        # An owned pool caches base_params in each worker via the initializer;
+        # a caller-supplied executor receives them with each chunk instead
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ProcessPoolExecutor(max_workers=n_workers,
+                                           initializer=_init_worker,
+                                           initargs=(self.base_params,))
+            chunk_base_params = None
+        else:
+            chunk_base_params = self.base_params
+        
+        # Chunks are collected in completion order (each row carries its flat
+        # cell index), advancing the progress bar once per chunk
+        chunk_results = []
+        futures = []
+        try:
+            futures = [executor.submit(_run_chunk, chunk, seeds, chunk_base_params)
+                       for chunk in chunks]
+            with tqdm(total=n_cells) as pbar:
+                for future in as_completed(futures):
+                    result = future.result()
+                    chunk_results.append(result)
+                    pbar.update(len(result))
+        except BaseException:
+            # Fail fast: drop the chunks still queued so shutdown() below only
+            # waits for the ones already running (shutdown's cancel_futures
+            # flag does the same but needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            if owns_executor:
+                executor.shutdown()
+        
+        # Aggregate by flat cell index: one bincount per grid, averaged over
+        # the results that landed in each cell
+        results = np.concatenate(chunk_results)
+        idx = results[:, 0].astype(np.intp)
+        grid_shape = (male_space_points, female_activation_points)
+        count = np.maximum(np.bincount(idx, minlength=n_cells), 1)
+        
+        def _cell_mean(values: np.ndarray) -> np.ndarray:
+            return (np.bincount(idx, weights=values, minlength=n_cells) / count).reshape(grid_shape)
         
         return {
             'male_space_values': male_space_values,
             'female_activation_values': female_activation_values,
-            'innovation_grid': innovation_grid,
-            'synergy_grid': synergy_grid,
-            'diversity_grid': diversity_grid
+            'innovation_grid': _cell_mean(results[:, 1]),
+            'synergy_grid': _cell_mean(results[:, 2]),
+            'diversity_grid': _cell_mean(results[:, 3])
         }
     
-    def _run_single_simulation(self, params: Dict[str, Any], 
-                               base_params: Dict[str, Any]) -> Tuple[Tuple[int, int], float, float, float]:
-        """
-        Run a single simulation for parameter scanning.
-        
-        Parameters
-        ----------
-        params : dict
-            Simulation parameters
-        base_params : dict
-            Base parameters
-        
-        Returns
-        -------
-        tuple
-            ((i, j), innovation_rate, avg_synergy, avg_diversity)
-        """
-        # Merge parameters
-        sim_params = base_params.copy()
-        sim_params.update({
-            'male_explore_space': params['male_explore_space'],
-            'female_activation': params['female_activation']
-        })
-        
-        # Create and run model
-        model = CivilizationModel(
-            male_explore_space=params['male_explore_space'],
-            female_activation=params['female_activation'],
-            seed=params['seed'],
-            params=sim_params
-        )
-        
-        innovations, synergies, metadata = model.run()
-        
-        return (
-            params['grid_position'],
-            metadata['innovation_rate'],
-            metadata['avg_synergy'],
-            metadata['diversity']
-        )
-    
     def detect_critical_point(self, innovation_grid: np.ndarray, 
                               x_values: np.ndarray, 
                               y_values: np.ndarray,
@@ -204,6 +281,31 @@ class ParameterScanner:
         
         return critical_x, critical_y
     
+    @staticmethod
+    def nearest_index(values: np.ndarray, x: float) -> int:
+        """
+        Index of the grid value closest to x.
+        
+        Binary search on a sorted scan axis; on an exact tie the lower index
+        wins, as with ``np.argmin(np.abs(values - x))``.
+        
+        Parameters
+        ----------
+        values : np.ndarray
+            Strictly increasing 1D grid values (e.g., ``female_activation_values``)
+        x : float
+            Value to look up
+        
+        Returns
+        -------
+        int
+            Index into ``values``
+        """
+        if len(values) == 1:
+            return 0
+        i = int(np.clip(np.searchsorted(values, x), 1, len(values) - 1))
+        return i - int(x - values[i - 1] <= values[i] - x)
+    
     def calculate_phase_boundary(self, 
                                  innovation_grid: np.ndarray,
                                  threshold: float = 0.05) -> np.ndarray:
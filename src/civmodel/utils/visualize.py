@@ -4,23 +4,416 @@ Visualization utilities for the civilization meta-model.
 
 import numpy as np
 import matplotlib.pyplot as plt
+from functools import lru_cache
 from matplotlib import colors
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.ticker import PercentFormatter
 from mpl_toolkits.mplot3d import Axes3D
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
+
+from .._kernels import rolling_mean_kernel
+
+# Series length x window size above which weighted moving averages use FFT
+# convolution instead of direct convolution
+_FFT_CONVOLVE_MIN_WORK = 5_000_000
+
+
+def _rolling_mean(x: np.ndarray, window: int,
+                  weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Moving average over full windows (same as ``np.convolve(..., mode='valid')``).
+    
+    With ``weights`` (one per window position, oldest sample first) a
+    weighted average is computed instead; direct convolution is used for
+    short series and FFT convolution once ``len(x) * window`` is large.
+    
+    Uses the compiled running-sum kernel when Numba is available, otherwise
+    a prefix sum; either way the cost is O(n) regardless of the window size.
+    Boolean input is summed exactly with an integer prefix sum over its
+    one-byte view, without converting it to float first.
+    """
+    x = np.asarray(x)
+    
+    if weights is not None:
+        kernel = np.asarray(weights, dtype=np.float64)[::-1]
+        kernel = kernel / kernel.sum()
+        x = x.astype(np.float64, copy=False)
+        if len(x) * len(kernel) > _FFT_CONVOLVE_MIN_WORK:
+            from scipy.signal import fftconvolve
+            return fftconvolve(x, kernel, mode='valid')
+        return np.convolve(x, kernel, mode='valid')
+    
+    out = np.empty(len(x) - window + 1)
+    
+    if x.dtype == np.bool_:
+        cs = np.cumsum(x.view(np.uint8), dtype=np.int64)
+    elif rolling_mean_kernel is not None:
+        return rolling_mean_kernel(np.asarray(x, dtype=np.float64), window, out)
+    else:
+        cs = np.cumsum(x, dtype=np.float64)
+    
+    # Window sums are differences of the prefix sum
+    out[0] = cs[window - 1]
+    np.subtract(cs[window:], cs[:-window], out=out[1:])
+    out *= 1.0 / window
+    return out
+
+
+@lru_cache(maxsize=32)
+def _gaussian_kernel(sigma: float, order: int = 0) -> np.ndarray:
+    """
+    Read-only 1D Gaussian correlation taps, truncated at 4 sigma.
+    
+    ``order=0`` gives the normalized smoothing kernel and ``order=1`` the
+    first-derivative kernel, with the same taps as ``scipy.ndimage``.
+    """
+    radius = int(4 * sigma + 0.5)
+    taps = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (taps / sigma) ** 2)
+    kernel /= kernel.sum()
+    if order == 1:
+        kernel *= taps / sigma ** 2
+    kernel.setflags(write=False)
+    return kernel
+
+
+def _correlate_rows(a: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Correlate every column of ``a`` with ``kernel``, reflecting at the edges."""
+    radius = len(kernel) // 2
+    padded = np.pad(a, ((radius, radius), (0, 0)), mode='symmetric')
+    n = a.shape[0]
+    return sum(w * padded[j:j + n] for j, w in enumerate(kernel))
+
+
+def _gradient_magnitude(grid: np.ndarray, sigma: float = 1.0) -> np.ndarray:
+    """
+    Gradient magnitude of a 2D grid with Gaussian derivatives.
+    
+    Equivalent to ``scipy.ndimage.gaussian_gradient_magnitude`` (reflecting
+    edges, 4-sigma truncation), computed with separable NumPy passes: each
+    axis is differentiated with the derivative kernel after smoothing
+    along the other axis.
+    """
+    grid = np.asarray(grid, dtype=float)
+    smooth = _gaussian_kernel(sigma)
+    derivative = _gaussian_kernel(sigma, order=1)
+    
+    gy = _correlate_rows(_correlate_rows(grid.T, smooth).T, derivative)
+    gx = _correlate_rows(_correlate_rows(grid, smooth).T, derivative).T
+    return np.hypot(gx, gy)
+
+
+def _new_figure(figsize: tuple, batch: bool) -> Figure:
+    """
+    Create a constrained-layout figure, through pyplot unless ``batch``.
+    
+    Batch figures are attached to an Agg canvas directly and never
+    registered with pyplot's figure manager.
+    """
+    if batch:
+        fig = Figure(figsize=figsize, layout='constrained')
+        FigureCanvasAgg(fig)
+        return fig
+    return plt.figure(figsize=figsize, layout='constrained')
+
+
+def _display_grid(grid: np.ndarray, max_display: Optional[int]) -> np.ndarray:
+    """
+    Stride-sliced view of ``grid`` with at most ``max_display`` cells per axis.
+    
+    Only used for rasterized layers; the full grid is kept for contours and
+    gradient calculations.
+    """
+    if max_display is None:
+        return grid
+    strides = [-(-n // max_display) for n in grid.shape[:2]]
+    return grid[::strides[0], ::strides[1]]
+
+
+# Panels drawn by plot_phase_diagram, in layout order
+_PHASE_DIAGRAM_PLOTS = ('innov', 'syn', 'surface', 'curves', 'threshold', 'critical')
+
+# Historical reference points (female activation, male exploration space)
+_HISTORICAL_POINTS = {
+    'Stagnation': (0.1, 0.3),
+    'Window Period': (0.3, 0.75),
+    'Transition': (0.7, 0.85)
+}
+
+
+def _remove_contours(contour_set) -> None:
+    """Remove a ContourSet from its axes (older Matplotlib lacks ``remove``)."""
+    if hasattr(contour_set, 'remove'):
+        contour_set.remove()
+    else:
+        for collection in contour_set.collections:
+            collection.remove()
+
+
+class PhaseDiagramFigure:
+    """
+    Reusable phase diagram figure.
+    
+    The axes, heatmap images, colorbars, curves and reference points are
+    built once; ``update`` then only swaps in new scan data. This makes
+    redrawing many scans (e.g. frames of a sweep) much cheaper than building
+    a new figure each time. The surface and contours have no in-place
+    update and are replaced on each ``update``.
+    
+    Parameters
+    ----------
+    figsize : tuple, default=(12, 10)
+        Figure size
+    cmap_innovation : str, default='RdYlGn'
+        Colormap for innovation rate
+    cmap_synergy : str, default='YlOrBr'
+        Colormap for synergy
+    plots : iterable of str, optional
+        Panels to draw, any of 'innov', 'syn', 'surface', 'curves',
+        'threshold' and 'critical' (all if None). Selected panels are laid
+        out in that order, three per row.
+    max_display : int, optional, default=512
+        Maximum number of cells per axis rendered by the heatmaps; larger
+        grids are downsampled by striding (None renders the full grid)
+    batch : bool, default=False
+        Build the figure directly on an Agg canvas, bypassing pyplot's figure
+        manager (for saving many figures in a loop; the figure is not shown
+        by ``plt.show()``)
+    
+    Examples
+    --------
+    >>> diagram = PhaseDiagramFigure(batch=True)
+    >>> for k, results in enumerate(scans):
+    ...     diagram.update(results).fig.savefig(f'frame_{k:04d}.png')
+    """
+    
+    def __init__(self,
+                 figsize: tuple = (12, 10),
+                 cmap_innovation: str = 'RdYlGn',
+                 cmap_synergy: str = 'YlOrBr',
+                 plots: Optional[Iterable[str]] = None,
+                 max_display: Optional[int] = 512,
+                 batch: bool = False):
+        if plots is None:
+            plots = set(_PHASE_DIAGRAM_PLOTS)
+        else:
+            plots = set(plots)
+            unknown = plots.difference(_PHASE_DIAGRAM_PLOTS)
+            if unknown:
+                raise ValueError(f"Unknown plots: {sorted(unknown)}; "
+                                 f"choose from {_PHASE_DIAGRAM_PLOTS}")
+        self.plots = plots
+        self.cmap_innovation = cmap_innovation
+        self.max_display = max_display
+        
+        # Axes are created only for the selected panels, the 3D one directly
+        # with its projection
+        n_panels = len(plots)
+        ncols = min(3, n_panels)
+        nrows = -(-n_panels // 3)
+        self.fig = fig = _new_figure(figsize, batch)
+        panel_positions = iter(range(1, n_panels + 1))
+        
+        def _next_axis(**kwargs):
+            return fig.add_subplot(nrows, ncols, next(panel_positions), **kwargs)
+        
+        # Heatmaps start from a placeholder and receive data in update()
+        placeholder = np.zeros((1, 1))
+        heatmap_kw = dict(aspect='auto', origin='lower')
+        self.axes = {}
+        
+        # 1. Innovation rate heatmap
+        if 'innov' in plots:
+            ax1 = self.axes['innov'] = _next_axis()
+            # Rates are shown as percentages by the colorbar formatter rather
+            # than by scaling (copying) the grid
+            self._im_innov = ax1.imshow(placeholder, cmap=cmap_innovation, **heatmap_kw)
+            ax1.set_xlabel('Female Activation')
+            ax1.set_ylabel('Male Exploration Space')
+            ax1.set_title('Innovation Rate (%)')
+            fig.colorbar(self._im_innov, ax=ax1, format=PercentFormatter(xmax=1))
+        
+        # 2. Synergy heatmap
+        if 'syn' in plots:
+            ax2 = self.axes['syn'] = _next_axis()
+            self._im_syn = ax2.imshow(placeholder, cmap=cmap_synergy, **heatmap_kw)
+            ax2.set_xlabel('Female Activation')
+            ax2.set_ylabel('Male Exploration Space')
+            ax2.set_title('Synergy Multiplier')
+            fig.colorbar(self._im_syn, ax=ax2)
+        
+        # 3. 3D surface plot
+        if 'surface' in plots:
+            ax3 = self.axes['surface'] = _next_axis(projection='3d')
+            self._surface = None
+            ax3.zaxis.set_major_formatter(PercentFormatter(xmax=1))
+            ax3.set_xlabel('Female Activation')
+            ax3.set_ylabel('Male Exploration Space')
+            ax3.set_zlabel('Innovation Rate (%)')
+            ax3.set_title('Innovation Surface')
+        
+        # 4. Phase transition curves (one line per selected MS value)
+        if 'curves' in plots:
+            ax4 = self.axes['curves'] = _next_axis()
+            self._curves = ax4.plot(np.empty((0, 3)), linewidth=2, marker='o', markersize=4)
+            for line, color in zip(self._curves, ['blue', 'green', 'red']):
+                line.set_color(color)
+            ax4.set_xlabel('Female Activation')
+            ax4.set_ylabel('Innovation Rate (%)')
+            ax4.yaxis.set_major_formatter(PercentFormatter(xmax=1))
+            ax4.set_title('Phase Transition Curves')
+            ax4.grid(True, alpha=0.3)
+        
+        # 5. Synergy threshold effect
+        if 'threshold' in plots:
+            ax5 = self.axes['threshold'] = _next_axis()
+            
+            # Create custom colormap for synergy activation
+            cmap_syn = colors.ListedColormap(['lightgray', 'orange'])
+            
+            self._im_threshold = ax5.imshow(placeholder, cmap=cmap_syn, alpha=0.6,
+                                            vmin=0, vmax=1, **heatmap_kw)
+            self._contours = None
+            ax5.set_xlabel('Female Activation')
+            ax5.set_ylabel('Male Exploration Space')
+            ax5.set_title('Synergy Activation & Innovation Contours')
+        
+        # 6. Critical region detection
+        if 'critical' in plots:
+            ax6 = self.axes['critical'] = _next_axis()
+            self._im_critical = ax6.imshow(placeholder, cmap='Reds', alpha=0.7,
+                                           vmin=0, vmax=1, **heatmap_kw)
+            
+            # Historical reference points: one collection for all points;
+            # the legend uses marker proxies
+            point_colors = [f'C{i}' for i in range(len(_HISTORICAL_POINTS))]
+            fa_pts, ms_pts = np.array(list(_HISTORICAL_POINTS.values())).T
+            ax6.scatter(fa_pts, ms_pts, s=100, c=point_colors, edgecolor='black', alpha=0.8)
+            handles = [Line2D([], [], linestyle='', marker='o', markersize=10,
+                              markerfacecolor=color, markeredgecolor='black',
+                              alpha=0.8, label=label)
+                       for label, color in zip(_HISTORICAL_POINTS, point_colors)]
+            
+            ax6.set_xlabel('Female Activation')
+            ax6.set_ylabel('Male Exploration Space')
+            ax6.set_title('Critical Region & Historical Reference')
+            ax6.legend(handles=handles, loc='upper left', fontsize=9)
+    
+    def update(self, scan_results: Dict[str, np.ndarray],
+               redraw: bool = False) -> 'PhaseDiagramFigure':
+        """
+        Show new scan results in the existing figure.
+        
+        Parameters
+        ----------
+        scan_results : dict
+            Results from ParameterScanner.scan_2d(). Instead of separate
+            'innovation_grid' and 'synergy_grid' entries it may hold 'grids',
+            an array of shape (2, n_male_space, n_female_activation) with the
+            innovation and synergy grids stacked on the first axis.
+        redraw : bool, default=False
+            Request a canvas redraw (``draw_idle``), e.g. for an interactive
+            window; not needed before saving
+        
+        Returns
+        -------
+        PhaseDiagramFigure
+            self, for chaining
+        """
+        plots = self.plots
+        ms_vals = scan_results['male_space_values']
+        fa_vals = scan_results['female_activation_values']
+        extent = [fa_vals[0], fa_vals[-1], ms_vals[0], ms_vals[-1]]
+        
+        # Both channels live in one contiguous (2, n_ms, n_fa) block
+        if 'grids' in scan_results:
+            grids = np.asarray(scan_results['grids'])
+        else:
+            grids = np.stack((scan_results['innovation_grid'], scan_results['synergy_grid']))
+        innov_grid, syn_grid = grids[0], grids[1]
+        
+        def _show(image, grid: np.ndarray) -> None:
+            image.set_data(_display_grid(grid, self.max_display))
+            image.set_extent(extent)
+            image.axes.set_xlim(extent[0], extent[1])
+            image.axes.set_ylim(extent[2], extent[3])
+        
+        if 'innov' in plots:
+            _show(self._im_innov, innov_grid)
+            self._im_innov.set_clim(innov_grid.min(), innov_grid.max())
+        
+        if 'syn' in plots:
+            _show(self._im_syn, syn_grid)
+            self._im_syn.set_clim(syn_grid.min(), syn_grid.max())
+        
+        if 'surface' in plots:
+            ax3 = self.axes['surface']
+            if self._surface is not None:
+                self._surface.remove()
+                self._surface = None
+            FA, MS = np.meshgrid(fa_vals, ms_vals, copy=False)
+            try:
+                self._surface = ax3.plot_surface(FA, MS, innov_grid, cmap=self.cmap_innovation,
+                                                 alpha=0.8, linewidth=0.1, antialiased=True)
+            except:
+                ax3.axis('off')
+                ax3.text2D(0.5, 0.5, '3D plot unavailable', ha='center', va='center',
+                           transform=ax3.transAxes)
+        
+        if 'curves' in plots:
+            ax4 = self.axes['curves']
+            selected_indices = [0, len(ms_vals)//2, -1]
+            for line, ms_idx in zip(self._curves, selected_indices):
+                line.set_data(fa_vals, innov_grid[ms_idx, :])
+                line.set_label(f'MS={ms_vals[ms_idx]:.2f}')
+            ax4.relim()
+            ax4.autoscale_view()
+            ax4.legend()
+        
+        # Boolean panel masks are kept as 1-byte uint8 views (imshow maps
+        # integer arrays through the colormap directly)
+        if 'threshold' in plots:
+            ax5 = self.axes['threshold']
+            _show(self._im_threshold, (syn_grid > 1.0).view(np.uint8))
+            if self._contours is not None:
+                _remove_contours(self._contours)
+            self._contours = ax5.contour(fa_vals, ms_vals, innov_grid, 
+                                         levels=[0.05, 0.15, 0.25], colors=['blue', 'green', 'red'],
+                                         linewidths=[1, 2, 3])
+        
+        if 'critical' in plots:
+            # High gradient region (approximate critical line)
+            gradient = _gradient_magnitude(innov_grid, sigma=1.0)
+            _show(self._im_critical, (gradient > 0.5 * np.max(gradient)).view(np.uint8))
+        
+        if redraw:
+            self.fig.canvas.draw_idle()
+        return self
 
 
 def plot_phase_diagram(scan_results: Dict[str, np.ndarray],
                       figsize: tuple = (12, 10),
                       cmap_innovation: str = 'RdYlGn',
                       cmap_synergy: str = 'YlOrBr',
-                      save_path: Optional[str] = None) -> plt.Figure:
+                      save_path: Optional[str] = None,
+                      plots: Optional[Iterable[str]] = None,
+                      max_display: Optional[int] = 512,
+                      batch: bool = False) -> plt.Figure:
     """
     Create comprehensive phase diagram visualization.
     
+    Builds a one-off ``PhaseDiagramFigure``; use that class directly to
+    redraw many scans in the same figure.
+    
     Parameters
     ----------
     scan_results : dict
-        Results from ParameterScanner.scan_2d()
+        Results from ParameterScanner.scan_2d(). Instead of separate
+        'innovation_grid' and 'synergy_grid' entries it may hold 'grids',
+        an array of shape (2, n_male_space, n_female_activation) with the
+        innovation and synergy grids stacked on the first axis.
     figsize : tuple, default=(12, 10)
         Figure size
     cmap_innovation : str, default='RdYlGn'
@@ -29,128 +422,34 @@ def plot_phase_diagram(scan_results: Dict[str, np.ndarray],
         Colormap for synergy
     save_path : str, optional
         Path to save the figure
+    plots : iterable of str, optional
+        Panels to draw, any of 'innov', 'syn', 'surface', 'curves',
+        'threshold' and 'critical' (all if None). Selected panels are laid
+        out in that order, three per row.
+    max_display : int, optional, default=512
+        Maximum number of cells per axis rendered by the heatmaps; larger
+        grids are downsampled by striding (None renders the full grid)
+    batch : bool, default=False
+        Build the figure directly on an Agg canvas, bypassing pyplot's figure
+        manager (for saving many figures in a loop; the figure is not shown
+        by ``plt.show()``)
     
     Returns
     -------
     matplotlib.figure.Figure
     """
-    ms_vals = scan_results['male_space_values']
-    fa_vals = scan_results['female_activation_values']
-    innov_grid = scan_results['innovation_grid']
-    syn_grid = scan_results['synergy_grid']
-    
-    fig, axes = plt.subplots(2, 3, figsize=figsize)
-    
-    # 1. Innovation rate heatmap
-    ax1 = axes[0, 0]
-    im1 = ax1.imshow(innov_grid * 100, aspect='auto', origin='lower',
-                    extent=[fa_vals[0], fa_vals[-1], ms_vals[0], ms_vals[-1]],
-                    cmap=cmap_innovation)
-    ax1.set_xlabel('Female Activation')
-    ax1.set_ylabel('Male Exploration Space')
-    ax1.set_title('Innovation Rate (%)')
-    plt.colorbar(im1, ax=ax1)
-    
-    # 2. Synergy heatmap
-    ax2 = axes[0, 1]
-    im2 = ax2.imshow(syn_grid, aspect='auto', origin='lower',
-                    extent=[fa_vals[0], fa_vals[-1], ms_vals[0], ms_vals[-1]],
-                    cmap=cmap_synergy)
-    ax2.set_xlabel('Female Activation')
-    ax2.set_ylabel('Male Exploration Space')
-    ax2.set_title('Synergy Multiplier')
-    plt.colorbar(im2, ax=ax2)
-    
-    # 3. 3D surface plot
-    ax3 = axes[0, 2]
-    FA, MS = np.meshgrid(fa_vals, ms_vals)
-    
-    try:
-        ax3.remove()
-        ax3 = fig.add_subplot(2, 3, 3, projection='3d')
-        surf = ax3.plot_surface(FA, MS, innov_grid * 100, cmap=cmap_innovation,
-                               alpha=0.8, linewidth=0.1, antialiased=True)
-        ax3.set_xlabel('Female Activation')
-        ax3.set_ylabel('Male Exploration Space')
-        ax3.set_zlabel('Innovation Rate (%)')
-        ax3.set_title('Innovation Surface')
-    except:
-        ax3.axis('off')
-        ax3.text(0.5, 0.5, '3D plot unavailable', ha='center', va='center')
-    
-    # 4. Phase transition curves
-    ax4 = axes[1, 0]
-    selected_indices = [0, len(ms_vals)//2, -1]
-    colors_ = ['blue', 'green', 'red']
-    
-    for idx, ms_idx in enumerate(selected_indices):
-        ms = ms_vals[ms_idx]
-        innov_curve = innov_grid[ms_idx, :] * 100
-        ax4.plot(fa_vals, innov_curve, color=colors_[idx],
-                linewidth=2, marker='o', markersize=4,
-                label=f'MS={ms:.2f}')
-    
-    ax4.set_xlabel('Female Activation')
-    ax4.set_ylabel('Innovation Rate (%)')
-    ax4.set_title('Phase Transition Curves')
-    ax4.legend()
-    ax4.grid(True, alpha=0.3)
-    
-    # 5. Synergy threshold effect
-    ax5 = axes[1, 1]
-    threshold = 0.4  # Typical synergy threshold
-    synergy_active = syn_grid > 1.0
-    
-    # Create custom colormap for synergy activation
-    cmap_syn = colors.ListedColormap(['lightgray', 'orange'])
-    
-    im5 = ax5.imshow(synergy_active.astype(float), aspect='auto', origin='lower',
-                    extent=[fa_vals[0], fa_vals[-1], ms_vals[0], ms_vals[-1]],
-                    cmap=cmap_syn, alpha=0.6)
-    ax5.contour(fa_vals, ms_vals, innov_grid * 100, 
-               levels=[5, 15, 25], colors=['blue', 'green', 'red'],
-               linewidths=[1, 2, 3])
-    ax5.set_xlabel('Female Activation')
-    ax5.set_ylabel('Male Exploration Space')
-    ax5.set_title('Synergy Activation & Innovation Contours')
-    
-    # 6. Critical region detection
-    ax6 = axes[1, 2]
-    
-    # Detect high gradient region (approximate critical line)
-    from scipy.ndimage import gaussian_gradient_magnitude
-    gradient = gaussian_gradient_magnitude(innov_grid, sigma=1.0)
-    
-    # Normalize and threshold gradient
-    gradient_norm = gradient / np.max(gradient)
-    critical_region = gradient_norm > 0.5
-    
-    im6 = ax6.imshow(critical_region, aspect='auto', origin='lower',
-                    extent=[fa_vals[0], fa_vals[-1], ms_vals[0], ms_vals[-1]],
-                    cmap='Reds', alpha=0.7)
-    
-    # Add historical reference points
-    historical_points = {
-        'Stagnation': (0.1, 0.3),
-        'Window Period': (0.3, 0.75),
-        'Transition': (0.7, 0.85)
-    }
-    
-    for label, (fa, ms) in historical_points.items():
-        ax6.scatter(fa, ms, s=100, edgecolor='black', 
-                   label=label, alpha=0.8)
-    
-    ax6.set_xlabel('Female Activation')
-    ax6.set_ylabel('Male Exploration Space')
-    ax6.set_title('Critical Region & Historical Reference')
-    ax6.legend(loc='upper left', fontsize=9)
-    
-    plt.tight_layout()
+    diagram = PhaseDiagramFigure(figsize=figsize,
+                                 cmap_innovation=cmap_innovation,
+                                 cmap_synergy=cmap_synergy,
+                                 plots=plots,
+                                 max_display=max_display,
+                                 batch=batch)
+    diagram.update(scan_results)
     
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        diagram.fig.savefig(save_path, dpi=150, bbox_inches='tight')
     
-    return fig
+    return diagram.fig
 
 
 def plot_innovation_timeseries(innovations: np.ndarray,
@@ -158,7 +457,9 @@ def plot_innovation_timeseries(innovations: np.ndarray,
                               window: int = 30,
                               figsize: tuple = (10, 6),
                               title: Optional[str] = None,
-                              save_path: Optional[str] = None) -> plt.Figure:
+                              save_path: Optional[str] = None,
+                              weights: Optional[np.ndarray] = None,
+                              batch: bool = False) -> plt.Figure:
     """
     Plot innovation time series with optional synergy overlay.
     
@@ -176,31 +477,39 @@ def plot_innovation_timeseries(innovations: np.ndarray,
         Plot title
     save_path : str, optional
         Path to save the figure
+    weights : np.ndarray, optional
+        Moving average window weights (e.g. a tapered window), normalized
+        to sum to one; overrides ``window`` with their length. Uniform if None.
+    batch : bool, default=False
+        Build the figure directly on an Agg canvas, bypassing pyplot's figure
+        manager (for saving many figures in a loop; the figure is not shown
+        by ``plt.show()``)
     
     Returns
     -------
     matplotlib.figure.Figure
     """
-    fig, ax1 = plt.subplots(figsize=figsize)
+    fig = _new_figure(figsize, batch)
+    ax1 = fig.add_subplot()
     
-    # Convert boolean innovations to rate
-    innovations_float = innovations.astype(float)
+    innovations = np.asarray(innovations)
+    if weights is not None:
+        window = len(weights)
     
     # Calculate moving average
     if len(innovations) >= window:
-        weights = np.ones(window) / window
-        innovation_ma = np.convolve(innovations_float, weights, mode='valid')
+        innovation_ma = _rolling_mean(innovations, window, weights)
         time_axis = np.arange(len(innovation_ma))
         
         ax1.plot(time_axis, innovation_ma * 100, 'b-', 
                 linewidth=2, label='Innovation Rate (MA)')
         
         # Mark innovation events
-        innov_indices = np.where(innovations[:len(innovation_ma)])[0]
+        innov_indices = np.flatnonzero(innovations[:len(innovation_ma)])
         ax1.scatter(innov_indices, innovation_ma[innov_indices] * 100,
                    color='red', s=20, alpha=0.5, label='Innovation Events')
     else:
-        ax1.plot(innovations_float * 100, 'b-', linewidth=2, 
+        ax1.plot(innovations * 100.0, 'b-', linewidth=2, 
                 label='Innovation Rate')
     
     ax1.set_xlabel('Time Step')
@@ -214,8 +523,8 @@ def plot_innovation_timeseries(innovations: np.ndarray,
         ax2 = ax1.twinx()
         
         if len(synergies) >= window:
-            synergy_ma = np.convolve(synergies, weights, mode='valid')
-            ax2.plot(time_axis, synergy_ma, 'g--', 
+            synergy_ma = _rolling_mean(synergies, window, weights)
+            ax2.plot(np.arange(len(synergy_ma)), synergy_ma, 'g--', 
                     linewidth=1.5, alpha=0.7, label='Synergy (MA)')
         else:
             ax2.plot(synergies, 'g--', linewidth=1.5, 
@@ -232,13 +541,11 @@ def plot_innovation_timeseries(innovations: np.ndarray,
         ax1.legend(loc='upper left')
     
     if title:
-        plt.title(title)
+        ax1.set_title(title)
     else:
-        plt.title('Innovation Dynamics Time Series')
-    
-    plt.tight_layout()
+        ax1.set_title('Innovation Dynamics Time Series')
     
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        fig.savefig(save_path, dpi=150, bbox_inches='tight')
     
     return fig
\ No newline at end of file
@@ -7,6 +7,12 @@ import pytest
 from civmodel import CivilizationModel, PARAMS
 
 
+@pytest.fixture(scope="module")
+def seeded_model():
+    """Freshly initialized model shared by read-only tests."""
+    return CivilizationModel(seed=42)
+
+
 class TestCivilizationModel:
     """Test cases for CivilizationModel."""
     
@@ -22,8 +28,8 @@ class TestCivilizationModel:
         assert len(model.genders) == model.N
         
         # Check gender distribution
-        n_male = np.sum(model.genders == 'male')
-        n_female = np.sum(model.genders == 'female')
+        n_male = np.count_nonzero(model.is_male)
+        n_female = model.N - n_male
         assert abs(n_male - n_female) <= 1  # Allow for odd N
     
     def test_initialization_custom(self):
@@ -95,11 +101,9 @@ class TestCivilizationModel:
         # Innovation rate should be between 0 and 1
         assert 0 <= metadata["innovation_rate"] <= 1
     
-    def test_diversity_calculation(self):
+    def test_diversity_calculation(self, seeded_model):
         """Test cognitive diversity calculation."""
-        model = CivilizationModel(seed=42)
-        
-        diversity = model.calculate_diversity()
+        diversity = seeded_model.calculate_diversity()
         
         assert isinstance(diversity, float)
         assert diversity >= 0
@@ -107,24 +111,37 @@ class TestCivilizationModel:
         # With default parameters, diversity should be positive
         assert diversity > 0
     
-    def test_synergy_calculation(self):
+    @pytest.mark.parametrize("female_activation, has_synergy", [
+        (0.1, False),  # Low female activation: no synergy
+        (0.8, True),   # High female activation: synergy
+    ])
+    def test_synergy_calculation(self, female_activation, has_synergy):
         """Test synergy calculation."""
-        # Test with low female activation (no synergy)
-        model_low = CivilizationModel(female_activation=0.1, seed=42)
-        synergy_low = model_low.calculate_synergy()
-        assert synergy_low == 1.0
-        
-        # Test with high female activation (should have synergy)
-        model_high = CivilizationModel(female_activation=0.8, seed=42)
-        synergy_high = model_high.calculate_synergy()
-        assert synergy_high > 1.0
-        assert synergy_high <= PARAMS["synergy_upper_bound"]
-    
-    def test_system_state(self):
-        """Test system state retrieval."""
-        model = CivilizationModel(seed=42)
+        model = CivilizationModel(female_activation=female_activation, seed=42)
+        synergy = model.calculate_synergy()
         
-        state = model.get_system_state()
+        if has_synergy:
+            assert synergy > 1.0
+            assert synergy <= PARAMS["synergy_upper_bound"]
+        else:
+            assert synergy == 1.0
+    
+    def test_parameter_setters(self):
+        """Test that setting parameters refreshes the cached step constants."""
+        model = CivilizationModel(female_activation=0.1, seed=42)
+        assert model.calculate_synergy() == 1.0
+        
+        model.female_activation = 0.8
+        assert model.params["female_activation"] == 0.8
+        assert model.calculate_synergy() > 1.0
+        assert np.allclose(model.inst_mult[~model.is_male], 1 - 0.8 * 0.8)
+        
+        with pytest.raises(ValueError, match="male_explore_space must be between"):
+            model.male_explore_space = 1.5
+    
+    def test_system_state(self, seeded_model):
+        """Test system state retrieval."""
+        state = seeded_model.get_system_state()
         
         # Check required keys
         required_keys = ["male_mean", "female_mean", "system_mean", 
@@ -155,6 +172,68 @@ class TestCivilizationModel:
         assert np.array_equal(model1.institution, model2.institution)
         assert model1.innovation_count == model2.innovation_count
     
+    def test_run_batch_matches_run(self):
+        """Test that batched replicas reproduce individual seeded runs."""
+        seeds = [1, 2, 3]
+        model = CivilizationModel(male_explore_space=0.8, female_activation=0.5)
+        innovations, synergies, metadata = model.run_batch(seeds, steps=100)
+        
+        assert innovations.shape == (len(seeds), 100)
+        
+        for k, seed in enumerate(seeds):
+            single = CivilizationModel(male_explore_space=0.8, female_activation=0.5, seed=seed)
+            innov, syn, meta = single.run(steps=100)
+            
+            assert np.array_equal(innovations[k], innov)
+            assert np.allclose(synergies[k], syn)
+            assert metadata["innovation_rate"][k] == meta["innovation_rate"]
+    
+    def test_run_batch_rejects_overridden_dynamics(self):
+        """Test that run_batch refuses subclasses whose dynamics it would skip."""
+        class CappedSynergyModel(CivilizationModel):
+            def calculate_synergy(self):
+                return 1.0
+        
+        with pytest.raises(NotImplementedError, match="calculate_synergy"):
+            CappedSynergyModel(seed=42).run_batch([1, 2], steps=10)
+    
+    def test_step_kernel_matches_numpy(self):
+        """Test that the Numba step kernel reproduces the NumPy step exactly."""
+        pytest.importorskip("numba")
+        params = {"state_bounds": (-0.3, 0.3)}
+        fast = CivilizationModel(male_explore_space=0.8, female_activation=0.5,
+                                 seed=11, params=params)
+        slow = CivilizationModel(male_explore_space=0.8, female_activation=0.5,
+                                 seed=11, params=params)
+        slow._use_step_kernel = False
+        assert fast._use_step_kernel
+        
+        for _ in range(200):
+            assert fast.step() == slow.step()
+            assert np.array_equal(fast.states, slow.states)
+        
+        assert np.array_equal(fast.male_sum, slow.male_sum)
+        assert np.array_equal(fast.female_sum, slow.female_sum)
+    
+    def test_post_step_kernel_matches_numpy(self):
+        """Test that the Numba post-step kernel reproduces the NumPy updates."""
+        pytest.importorskip("numba")
+        fast = CivilizationModel(male_explore_space=0.8, female_activation=0.5, seed=7)
+        slow = CivilizationModel(male_explore_space=0.8, female_activation=0.5, seed=7)
+        slow._use_post_step_kernel = False
+        assert fast._use_post_step_kernel
+        
+        held = fast.get_system_state()["institution"]
+        held_before = held.copy()
+        
+        for _ in range(200):
+            assert fast.step() == slow.step()
+        
+        assert np.array_equal(fast.institution, slow.institution)
+        assert fast.innovation_count == slow.innovation_count
+        # Arrays handed out earlier are not modified by later steps
+        assert np.array_equal(held, held_before)
+    
     def test_innovation_detection_sensitivity(self):
         """Test that innovation detection responds to parameters."""
         # Low exploration should produce few innovations
@@ -0,0 +1,31 @@
+"""
+Unit tests for the parameter scanner.
+"""
+
+import numpy as np
+import pytest
+from civmodel import ParameterScanner
+
+
+class TestNearestIndex:
+    """Test cases for the grid lookup helper."""
+    
+    @pytest.mark.parametrize("values", [
+        np.linspace(0.0, 1.0, 25),
+        np.linspace(0.1, 1.0, 20),
+        np.array([0.0, 0.2, 0.7, 1.0]),
+        np.array([0.3]),
+    ])
+    def test_matches_argmin(self, values):
+        """Test against np.argmin(np.abs(values - x)), including exact ties."""
+        rng = np.random.default_rng(0)
+        midpoints = (values[:-1] + values[1:]) / 2
+        queries = np.concatenate([rng.uniform(-0.2, 1.2, 200), values, midpoints])
+        
+        for x in queries:
+            assert ParameterScanner.nearest_index(values, x) == np.argmin(np.abs(values - x))
+    
+    def test_tie_picks_lower_index(self):
+        """Test that a point halfway between grid values maps to the lower one."""
+        assert ParameterScanner.nearest_index(np.array([0.0, 0.5, 1.0]), 0.25) == 0
+        assert ParameterScanner.nearest_index(np.array([0.0, 0.5, 1.0]), 0.75) == 1
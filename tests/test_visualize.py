@@ -0,0 +1,135 @@
+"""
+Unit tests for the visualization utilities.
+"""
+
+import numpy as np
+import pytest
+from scipy.ndimage import gaussian_gradient_magnitude
+
+from civmodel import PhaseDiagramFigure, plot_innovation_timeseries
+from civmodel.utils.visualize import (
+    _FFT_CONVOLVE_MIN_WORK, _gradient_magnitude, _rolling_mean
+)
+
+
+def _scan_results(n_ms: int = 12, n_fa: int = 15, center: float = 1.1,
+                  noise: float = 0.0, seed: int = 0) -> dict:
+    """Synthetic scan results with a smooth phase transition."""
+    ms_vals = np.linspace(0.2, 1.0, n_ms)
+    fa_vals = np.linspace(0.0, 1.0, n_fa)
+    ms, fa = np.meshgrid(ms_vals, fa_vals, indexing='ij')
+    innov = 0.3 / (1 + np.exp(-12 * (fa + ms - center)))
+    innov += np.random.default_rng(seed).normal(0, noise, innov.shape)
+    return {
+        'male_space_values': ms_vals,
+        'female_activation_values': fa_vals,
+        'innovation_grid': innov,
+        'synergy_grid': 1 + 2 * innov - 0.1,
+    }
+
+
+class TestRollingMean:
+    """Test cases for the moving average helper."""
+    
+    @pytest.mark.parametrize("window", [1, 7, 30, 200])
+    def test_matches_convolve(self, window):
+        """Test float and boolean input against np.convolve."""
+        rng = np.random.default_rng(0)
+        values = rng.random(200)
+        events = values < 0.3
+        uniform = np.ones(window) / window
+        
+        assert np.allclose(_rolling_mean(values, window),
+                           np.convolve(values, uniform, mode='valid'))
+        assert np.allclose(_rolling_mean(events, window),
+                           np.convolve(events.astype(float), uniform, mode='valid'))
+        assert np.allclose(_rolling_mean(list(values), window),
+                           np.convolve(values, uniform, mode='valid'))
+    
+    def test_weighted(self):
+        """Test weighted windows, direct and FFT-sized."""
+        rng = np.random.default_rng(1)
+        weights = np.hanning(12)[1:-1]
+        normalized = weights / weights.sum()
+        
+        short = rng.random(300)
+        expected = np.array([short[i:i + 10] @ normalized for i in range(len(short) - 9)])
+        assert np.allclose(_rolling_mean(short, 10, weights), expected)
+        
+        # Large enough to take the FFT convolution path
+        window = 500
+        long = rng.random(_FFT_CONVOLVE_MIN_WORK // window + 1000)
+        taper = np.hanning(window + 2)[1:-1]
+        expected = np.convolve(long, (taper / taper.sum())[::-1], mode='valid')
+        assert np.allclose(_rolling_mean(long, window, taper), expected)
+
+
+class TestGradientMagnitude:
+    """Test cases for the critical-region gradient."""
+    
+    @pytest.mark.parametrize("noise", [0.0, 0.01, 0.05])
+    @pytest.mark.parametrize("sigma", [0.5, 1.0, 2.0])
+    def test_matches_scipy(self, noise, sigma):
+        """Test against scipy.ndimage.gaussian_gradient_magnitude."""
+        grid = _scan_results(noise=noise)['innovation_grid']
+        expected = gaussian_gradient_magnitude(grid, sigma=sigma)
+        
+        assert np.allclose(_gradient_magnitude(grid, sigma=sigma), expected)
+    
+    def test_critical_region_matches_scipy(self):
+        """Test that the thresholded critical region is unchanged."""
+        grid = np.random.default_rng(2).random((12, 15)) * 0.3
+        ours = _gradient_magnitude(grid)
+        reference = gaussian_gradient_magnitude(grid, sigma=1.0)
+        
+        assert np.array_equal(ours > 0.5 * ours.max(), reference > 0.5 * reference.max())
+
+
+class TestPlots:
+    """Smoke tests for the plotting functions in batch mode."""
+    
+    def test_phase_diagram_update(self):
+        """Test that a phase diagram can be updated with new scan results."""
+        diagram = PhaseDiagramFigure(batch=True)
+        assert len(diagram.axes) == 6
+        
+        diagram.update(_scan_results())
+        diagram.update(_scan_results(n_ms=20, n_fa=10, center=0.9, noise=0.01))
+        diagram.fig.canvas.draw()
+        
+        ms_vals = np.linspace(0.2, 1.0, 20)
+        ax = diagram.axes['threshold']
+        assert ax.get_ylim() == (ms_vals[0], ms_vals[-1])
+        assert len(ax.collections) == 1  # Old contours were replaced
+        assert [line.get_label() for line in diagram.axes['curves'].lines] == [
+            f'MS={ms_vals[i]:.2f}' for i in (0, 10, -1)
+        ]
+    
+    def test_phase_diagram_subset(self):
+        """Test drawing a subset of panels from stacked grids."""
+        results = _scan_results()
+        stacked = {
+            'male_space_values': results['male_space_values'],
+            'female_activation_values': results['female_activation_values'],
+            'grids': np.stack((results['innovation_grid'], results['synergy_grid'])),
+        }
+        diagram = PhaseDiagramFigure(plots=['innov', 'curves'], batch=True)
+        
+        diagram.update(stacked).update(stacked)
+        diagram.fig.canvas.draw()
+        
+        assert set(diagram.axes) == {'innov', 'curves'}
+        
+        with pytest.raises(ValueError, match="Unknown plots"):
+            PhaseDiagramFigure(plots=['innov', 'histogram'], batch=True)
+    
+    def test_innovation_timeseries(self):
+        """Test the time series plot with array and list input."""
+        rng = np.random.default_rng(3)
+        events = rng.random(200) < 0.2
+        synergies = list(1 + rng.random(200))
+        
+        fig = plot_innovation_timeseries(events, synergies, batch=True)
+        fig.canvas.draw()
+        fig = plot_innovation_timeseries(events[:10], synergies, batch=True)
+        fig.canvas.draw()